@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Shared SKILL.md frontmatter loading with a persistent parse cache.
+
+Parsed frontmatter is cached on disk keyed by path, size and mtime, so bulk
+operations only re-parse SKILL.md files that changed since the last run.
+
+The common flat schema (top-level scalars plus one level of nested mapping,
+e.g. metadata) is parsed without PyYAML; anything the fast parser is not sure
+about falls back to yaml.safe_load, which is imported only when needed.
+"""
+
+import os
+import re
+import threading
+from pathlib import Path
+
+FRONTMATTER_RE = re.compile(r"^---\n(.*?)\n---", re.DOTALL)
+KEY_LINE_RE = re.compile(r"^([A-Za-z_][A-Za-z0-9_-]*):(?: +(.*))?$")
+NESTED_LINE_RE = re.compile(r"^( +)([A-Za-z_][A-Za-z0-9_-]*):(?: +(.*))?$")
+# Plain scalars YAML might resolve to something other than a string
+# (numbers, booleans, null, timestamps) are left to PyYAML.
+NON_STRING_RE = re.compile(
+    r"^(?:[-+.0-9].*|~|null|true|false|yes|no|on|off|y|n|<<|=)$", re.IGNORECASE
+)
+PLAIN_INDICATORS = set("-?:,[]{}#&*!|>'\"%@`")
+# Keys PyYAML resolves to booleans or None (e.g. "on:" becomes True), not strings.
+NON_STRING_KEY_RE = re.compile(r"^(?:true|false|yes|no|on|off|null)$", re.IGNORECASE)
+
+
+class FrontmatterError(Exception):
+    """SKILL.md frontmatter could not be loaded.
+
+    kind is one of: missing, no_frontmatter, format, yaml, type.
+    """
+
+    def __init__(self, kind, message, detail=None):
+        super().__init__(message)
+        self.kind = kind
+        self.detail = detail
+
+
+def default_cache_path():
+    codex_home = os.environ.get("CODEX_HOME", os.path.expanduser("~/.codex"))
+    return os.path.join(codex_home, "cache", "frontmatter.json")
+
+
+class FrontmatterCache:
+    """Frontmatter dicts keyed by SKILL.md path, validated against size and mtime
+
+    Safe to share between threads (e.g. the skills daemon's request handlers).
+    """
+
+    def __init__(self, path=None):
+        self.path = path or default_cache_path()
+        self.hits = 0
+        self.misses = 0
+        self._entries = None
+        self._new = {}
+        self._lock = threading.Lock()
+
+    def _load_file(self):
+        import json
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def _loaded(self):
+        if self._entries is None:
+            self._entries = self._load_file()
+        return self._entries
+
+    def get(self, skill_md, stat):
+        with self._lock:
+            entry = self._loaded().get(str(skill_md))
+            if (
+                isinstance(entry, dict)
+                and entry.get("size") == stat.st_size
+                and entry.get("mtime_ns") == stat.st_mtime_ns
+            ):
+                self.hits += 1
+                return entry["frontmatter"]
+            self.misses += 1
+            return None
+
+    def put(self, skill_md, stat, frontmatter):
+        import json
+
+        entry = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "frontmatter": frontmatter}
+        try:
+            json.dumps(entry)
+        except (TypeError, ValueError):
+            # Values such as YAML dates are not JSON serializable; just skip caching.
+            return
+        with self._lock:
+            self._loaded()[str(skill_md)] = entry
+            self._new[str(skill_md)] = entry
+
+    def drain_new(self):
+        """Return and forget the entries added since the last save"""
+        with self._lock:
+            new, self._new = self._new, {}
+        return new
+
+    def merge(self, entries):
+        with self._lock:
+            self._loaded().update(entries)
+            self._new.update(entries)
+
+    def save(self):
+        with self._lock:
+            self._save()
+
+    def _save(self):
+        if not self._new:
+            return
+        import json
+
+        entries = self._load_file()
+        entries.update(self._new)
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            # The cache is an optimization; a read-only home must not break callers.
+            return
+        self._entries = entries
+        self._new = {}
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def default_cache():
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = FrontmatterCache()
+        return _default_cache
+
+
+class _Unsupported(Exception):
+    """The fast parser cannot handle this input; defer to PyYAML."""
+
+
+def _scalar(raw):
+    raw = raw.rstrip()
+    if raw.startswith('"'):
+        inner = raw[1:-1]
+        if len(raw) < 2 or not raw.endswith('"') or '"' in inner or "\\" in inner:
+            raise _Unsupported
+        return inner
+    if raw.startswith("'"):
+        inner = raw[1:-1]
+        if len(raw) < 2 or not raw.endswith("'") or "'" in inner.replace("''", ""):
+            raise _Unsupported
+        return inner.replace("''", "'")
+    if (
+        not raw
+        or raw[0] in PLAIN_INDICATORS
+        or ": " in raw
+        or " #" in raw
+        or raw.endswith(":")
+        or NON_STRING_RE.match(raw)
+    ):
+        raise _Unsupported
+    return raw
+
+
+def _parse_flat(text):
+    if "\t" in text or "\r" in text:
+        raise _Unsupported
+    result = {}
+    lines = text.split("\n")
+    index = 0
+    while index < len(lines):
+        line = lines[index]
+        index += 1
+        if not line.strip() or line.startswith("#"):
+            continue
+        match = KEY_LINE_RE.match(line)
+        if not match:
+            raise _Unsupported
+        key, raw = match.group(1), match.group(2)
+        if NON_STRING_KEY_RE.match(key):
+            raise _Unsupported
+        if raw is not None and raw.strip():
+            result[key] = _scalar(raw)
+            if index < len(lines) and lines[index].startswith((" ", "\t")):
+                # Continuation lines of a multi-line plain scalar.
+                raise _Unsupported
+            continue
+        nested = {}
+        indent = None
+        while index < len(lines) and lines[index].startswith(" "):
+            nested_match = NESTED_LINE_RE.match(lines[index])
+            if not nested_match or nested_match.group(3) is None:
+                raise _Unsupported
+            if NON_STRING_KEY_RE.match(nested_match.group(2)):
+                raise _Unsupported
+            if indent is None:
+                indent = nested_match.group(1)
+            elif nested_match.group(1) != indent:
+                raise _Unsupported
+            nested[nested_match.group(2)] = _scalar(nested_match.group(3))
+            index += 1
+        result[key] = nested if nested else None
+    if not result:
+        raise _Unsupported
+    return result
+
+
+def parse_flat_yaml(text):
+    """Parse a flat YAML mapping, using PyYAML only for values the fast path can't handle"""
+    try:
+        return _parse_flat(text)
+    except _Unsupported:
+        pass
+    import yaml
+
+    return yaml.safe_load(text)
+
+
+def parse_frontmatter(content, fast=True):
+    """Parse the frontmatter block at the top of SKILL.md content into a dict"""
+    if not content.startswith("---"):
+        raise FrontmatterError("no_frontmatter", "No YAML frontmatter found")
+    match = FRONTMATTER_RE.match(content)
+    if not match:
+        raise FrontmatterError("format", "Invalid frontmatter format")
+    frontmatter = None
+    if fast:
+        try:
+            frontmatter = _parse_flat(match.group(1))
+        except _Unsupported:
+            pass
+    if frontmatter is None:
+        import yaml
+
+        try:
+            frontmatter = yaml.safe_load(match.group(1))
+        except yaml.YAMLError as e:
+            raise FrontmatterError("yaml", f"Invalid YAML in frontmatter: {e}", str(e)) from e
+    if not isinstance(frontmatter, dict):
+        raise FrontmatterError("type", "Frontmatter must be a YAML dictionary")
+    return frontmatter
+
+
+def load_frontmatter(skill_md, cache=None):
+    """Load SKILL.md frontmatter, served from cache when the file is unchanged"""
+    skill_md = Path(skill_md).resolve()
+    try:
+        stat = skill_md.stat()
+    except FileNotFoundError as e:
+        raise FrontmatterError("missing", "SKILL.md not found") from e
+    cache = default_cache() if cache is None else cache
+    frontmatter = cache.get(skill_md, stat)
+    if frontmatter is not None:
+        return frontmatter
+    frontmatter = parse_frontmatter(skill_md.read_text())
+    cache.put(skill_md, stat, frontmatter)
+    return frontmatter
@@ -7,12 +7,9 @@ Usage:
 """
 
 import argparse
-import re
 import sys
 from pathlib import Path
 
-import yaml
-
 ACRONYMS = {
     "GH",
     "MCP",
@@ -104,23 +101,19 @@ def generate_short_description(display_name):
 
 
 def read_frontmatter_name(skill_dir):
-    skill_md = Path(skill_dir) / "SKILL.md"
-    if not skill_md.exists():
-        print(f"[ERROR] SKILL.md not found in {skill_dir}")
-        return None
-    content = skill_md.read_text()
-    match = re.match(r"^---\n(.*?)\n---", content, re.DOTALL)
-    if not match:
-        print("[ERROR] Invalid SKILL.md frontmatter format.")
-        return None
-    frontmatter_text = match.group(1)
+    from frontmatter import FrontmatterError, load_frontmatter
+
     try:
-        frontmatter = yaml.safe_load(frontmatter_text)
-    except yaml.YAMLError as exc:
-        print(f"[ERROR] Invalid YAML frontmatter: {exc}")
-        return None
-    if not isinstance(frontmatter, dict):
-        print("[ERROR] Frontmatter must be a YAML dictionary.")
+        frontmatter = load_frontmatter(Path(skill_dir) / "SKILL.md")
+    except FrontmatterError as exc:
+        if exc.kind == "missing":
+            print(f"[ERROR] SKILL.md not found in {skill_dir}")
+        elif exc.kind == "yaml":
+            print(f"[ERROR] Invalid YAML frontmatter: {exc.detail}")
+        elif exc.kind == "type":
+            print("[ERROR] Frontmatter must be a YAML dictionary.")
+        else:
+            print("[ERROR] Invalid SKILL.md frontmatter format.")
         return None
     name = frontmatter.get("name", "")
     if not isinstance(name, str) or not name.strip():
@@ -212,6 +205,10 @@ def main():
         sys.exit(1)
 
     skill_name = args.name or read_frontmatter_name(skill_dir)
+    if not args.name:
+        from frontmatter import default_cache
+
+        default_cache().save()
     if not skill_name:
         sys.exit(1)
 
@@ -18,8 +18,6 @@ import re
 import sys
 from pathlib import Path
 
-from generate_openai_yaml import write_openai_yaml
-
 MAX_SKILL_NAME_LENGTH = 64
 ALLOWED_RESOURCES = {"scripts", "references", "assets"}
 
@@ -297,6 +295,8 @@ def init_skill(skill_name, path, resources, include_examples, interface_override
         return None
 
     # Create agents/openai.yaml
+    from generate_openai_yaml import write_openai_yaml
+
     try:
         result = write_openai_yaml(skill_dir, skill_name, interface_overrides)
         if not result:
@@ -3,39 +3,27 @@
 Quick validation script for skills - minimal version
 """
 
+import argparse
+import os
 import re
 import sys
+import time
 from pathlib import Path
 
-import yaml
+from frontmatter import FrontmatterError, default_cache, load_frontmatter
 
 MAX_SKILL_NAME_LENGTH = 64
+SKIP_DIRS = {".git", "__pycache__", "node_modules", ".venv", "venv"}
 
 
 def validate_skill(skill_path):
     """Basic validation of a skill"""
     skill_path = Path(skill_path)
 
-    skill_md = skill_path / "SKILL.md"
-    if not skill_md.exists():
-        return False, "SKILL.md not found"
-
-    content = skill_md.read_text()
-    if not content.startswith("---"):
-        return False, "No YAML frontmatter found"
-
-    match = re.match(r"^---\n(.*?)\n---", content, re.DOTALL)
-    if not match:
-        return False, "Invalid frontmatter format"
-
-    frontmatter_text = match.group(1)
-
     try:
-        frontmatter = yaml.safe_load(frontmatter_text)
-        if not isinstance(frontmatter, dict):
-            return False, "Frontmatter must be a YAML dictionary"
-    except yaml.YAMLError as e:
-        return False, f"Invalid YAML in frontmatter: {e}"
+        frontmatter = load_frontmatter(skill_path / "SKILL.md")
+    except FrontmatterError as e:
+        return False, str(e)
 
     allowed_properties = {"name", "description", "license", "allowed-tools", "metadata"}
 
@@ -91,11 +79,143 @@ def validate_skill(skill_path):
     return True, "Skill is valid!"
 
 
-if __name__ == "__main__":
-    if len(sys.argv) != 2:
+def find_skills(root):
+    """Return every directory under root that contains a SKILL.md"""
+    skills = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+        if "SKILL.md" in filenames:
+            skills.append(dirpath)
+    return skills
+
+
+def _timed_validate(skill_path):
+    cache = default_cache()
+    hits = cache.hits
+    start = time.perf_counter()
+    valid, message = validate_skill(skill_path)
+    return {
+        "path": skill_path,
+        "valid": valid,
+        "message": message,
+        "seconds": time.perf_counter() - start,
+        "cache_hit": cache.hits > hits,
+        # Worker processes hand new cache entries back to the parent to persist.
+        "cache_entries": cache.drain_new(),
+    }
+
+
+def validate_tree(root, jobs=None):
+    """Validate every skill under root in a process pool and aggregate the results"""
+    start = time.perf_counter()
+    skill_paths = find_skills(root)
+    if len(skill_paths) <= 1 or jobs == 1:
+        results = [_timed_validate(path) for path in skill_paths]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(_timed_validate, skill_paths))
+    cache = default_cache()
+    for result in results:
+        result["path"] = os.path.relpath(result["path"], root)
+        cache.merge(result.pop("cache_entries"))
+    cache.save()
+    failed = sum(1 for result in results if not result["valid"])
+    hits = sum(1 for result in results if result["cache_hit"])
+    return {
+        "root": str(root),
+        "total": len(results),
+        "passed": len(results) - failed,
+        "failed": failed,
+        "seconds": time.perf_counter() - start,
+        "cache": {"hits": hits, "misses": len(results) - hits},
+        "skills": results,
+    }
+
+
+def format_text_report(report):
+    lines = []
+    for result in report["skills"]:
+        status = "PASS" if result["valid"] else "FAIL"
+        lines.append(f"[{status}] {result['path']} ({result['seconds'] * 1000:.1f} ms)")
+        if not result["valid"]:
+            lines.append(f"       {result['message']}")
+    lines.append(
+        f"{report['passed']} passed, {report['failed']} failed "
+        f"in {report['seconds']:.2f}s "
+        f"(frontmatter cache: {report['cache']['hits']} hits, {report['cache']['misses']} misses)"
+    )
+    return "\n".join(lines)
+
+
+def format_junit_report(report):
+    from xml.etree import ElementTree
+
+    suite = ElementTree.Element(
+        "testsuite",
+        name="skills",
+        tests=str(report["total"]),
+        failures=str(report["failed"]),
+        time=f"{report['seconds']:.3f}",
+    )
+    for result in report["skills"]:
+        case = ElementTree.SubElement(
+            suite,
+            "testcase",
+            classname="skills",
+            name=result["path"],
+            time=f"{result['seconds']:.3f}",
+        )
+        if not result["valid"]:
+            ElementTree.SubElement(case, "failure", message=result["message"])
+    return ElementTree.tostring(suite, encoding="unicode")
+
+
+def _positive_int(value):
+    try:
+        number = int(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"invalid integer: {value}") from exc
+    if number < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return number
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate a skill directory.")
+    parser.add_argument("skill_directory", nargs="?", help="Skill directory to validate")
+    parser.add_argument("--tree", help="Validate every skill found under this root")
+    parser.add_argument(
+        "--format",
+        choices=["text", "json", "junit"],
+        default="text",
+        help="Report format for --tree",
+    )
+    parser.add_argument("--jobs", type=_positive_int, help="Worker processes for --tree")
+    args = parser.parse_args()
+
+    if args.tree:
+        report = validate_tree(args.tree, args.jobs)
+        if args.format == "json":
+            import json
+
+            print(json.dumps(report, indent=2))
+        elif args.format == "junit":
+            print(format_junit_report(report))
+        else:
+            print(format_text_report(report))
+        sys.exit(0 if report["failed"] == 0 else 1)
+
+    if not args.skill_directory:
         print("Usage: python quick_validate.py <skill_directory>")
         sys.exit(1)
 
-    valid, message = validate_skill(sys.argv[1])
+    valid, message = validate_skill(args.skill_directory)
+    default_cache().save()
     print(message)
     sys.exit(0 if valid else 1)
+
+
+if __name__ == "__main__":
+    main()
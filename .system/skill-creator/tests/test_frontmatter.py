@@ -0,0 +1,72 @@
+"""Tests for frontmatter.py."""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from frontmatter import FrontmatterCache, parse_frontmatter  # noqa: E402
+
+CASES = {
+    "flat": "name: demo\ndescription: A demo skill\n",
+    "nested": "name: demo\nmetadata:\n  short-description: Demo\n  owner: team\n",
+    "quoted": "name: 'it''s'\ndescription: \"quoted\"\n",
+    "boolean keys": "name: demo\non: push\nyes: 1\nno: x\noff: y\n",
+    "capitalized boolean keys": "name: demo\nOn: push\nYES: x\nFalse: y\nnull: z\n",
+    "nested boolean keys": "name: demo\nmetadata:\n  on: push\n  off: pull\n",
+    "boolean-like values": "name: demo\nenabled: yes\nmode: off\n",
+    "y and n keys": "name: demo\ny: up\nn: down\n",
+}
+
+
+class FastParserAgreesWithPyYAMLTest(unittest.TestCase):
+    def test_cases(self):
+        for label, frontmatter in CASES.items():
+            content = f"---\n{frontmatter}---\nBody\n"
+            with self.subTest(label):
+                self.assertEqual(
+                    parse_frontmatter(content, fast=True),
+                    parse_frontmatter(content, fast=False),
+                )
+
+    def test_boolean_keys_follow_pyyaml(self):
+        parsed = parse_frontmatter("---\nname: demo\non: push\n---\n")
+        self.assertEqual(parsed, {"name": "demo", True: "push"})
+
+
+class FrontmatterCacheThreadsTest(unittest.TestCase):
+    def test_concurrent_put_and_save(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            skill_md = os.path.join(tmp, "SKILL.md")
+            with open(skill_md, "w", encoding="utf-8") as f:
+                f.write("---\nname: demo\n---\n")
+            stat = os.stat(skill_md)
+            cache = FrontmatterCache(os.path.join(tmp, "cache", "frontmatter.json"))
+            errors = []
+
+            def worker(number):
+                try:
+                    for index in range(50):
+                        cache.put(f"{tmp}/{number}/{index}/SKILL.md", stat, {"name": "demo"})
+                        cache.get(skill_md, stat)
+                        cache.save()
+                except Exception as exc:
+                    errors.append(exc)
+
+            threads = [threading.Thread(target=worker, args=(number,)) for number in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(errors, [])
+            with open(cache.path, encoding="utf-8") as f:
+                self.assertEqual(len(json.load(f)), 8 * 50)
+            self.assertEqual(os.listdir(os.path.dirname(cache.path)), ["frontmatter.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,19 +3,398 @@
 
 from __future__ import annotations
 
+import io
 import os
-import urllib.request
+import threading
+import time
 
+# Network, TLS and compression modules are imported where they are used, so
+# scripts that only parse arguments or hit an error path start quickly.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import http.client
+    import ssl
+    import urllib.error
+    import urllib.parse
 
-def github_request(url: str, user_agent: str) -> bytes:
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+DEFAULT_CACHE_TTL = 300.0
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+MAX_BACKOFF = 60.0
+MAX_REDIRECTS = 5
+MAX_IDLE_PER_HOST = 4
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+
+
+def _stale_connection_errors() -> tuple[type[BaseException], ...]:
+    """Errors raised when a pooled keep-alive connection was closed by the server."""
+    import http.client
+
+    return (
+        http.client.RemoteDisconnected,
+        http.client.BadStatusLine,
+        BrokenPipeError,
+        ConnectionResetError,
+    )
+
+
+class HttpResponse:
+    __slots__ = ("status", "headers", "body")
+
+    def __init__(self, status: int, headers: dict[str, str], body: bytes) -> None:
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+
+class HttpClient:
+    """Keep-alive HTTP client that pools connections per (scheme, host, port).
+
+    Idle connections are reused across calls; concurrent callers each check out
+    their own connection, so one client can be shared between threads.
+    """
+
+    def __init__(
+        self,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        max_idle_per_host: int = MAX_IDLE_PER_HOST,
+    ) -> None:
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_idle_per_host = max_idle_per_host
+        self._idle: dict[tuple[str, str, int], list[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self._ssl_context: ssl.SSLContext | None = None
+
+    def request(self, url: str, headers: dict[str, str] | None = None) -> HttpResponse:
+        """GET url and return the decoded response; raises HTTPError on 4xx/5xx."""
+        request_headers = {"Accept-Encoding": "gzip", **(headers or {})}
+        status, response_headers, body = self._send(url, request_headers, None)
+        return HttpResponse(status, response_headers, body)
+
+    def download(
+        self, url: str, dest_path: str, headers: dict[str, str] | None = None
+    ) -> int:
+        """Stream the body of url to dest_path in chunks and return the byte count."""
+        with open(dest_path, "wb") as file_handle:
+            _, _, written = self._send(url, dict(headers or {}), file_handle)
+        return written
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for conn in connections:
+                conn.close()
+
+    def _send(self, url: str, headers: dict[str, str], sink: io.BufferedWriter | None):
+        import http.client
+        import urllib.parse
+
+        stale_errors = _stale_connection_errors()
+        attempt = 0
+        redirects = 0
+        while True:
+            parsed = urllib.parse.urlsplit(url)
+            key = _connection_key(parsed)
+            conn, reused = self._checkout(key)
+            target = urllib.parse.urlunsplit(("", "", parsed.path or "/", parsed.query, ""))
+            if key[0] == "http" and _proxy_for(key[0], key[1]):
+                target = url
+            try:
+                conn.request("GET", target, headers=headers)
+                resp = conn.getresponse()
+                status = resp.status
+                response_headers = {k.lower(): v for k, v in resp.getheaders()}
+                if status < 300 or status == 304:
+                    result = _read_body(resp, response_headers, sink)
+                else:
+                    result = resp.read()
+            except stale_errors:
+                conn.close()
+                _truncate(sink)
+                if reused:
+                    # The server dropped an idle keep-alive connection; retry on a fresh one.
+                    continue
+                if attempt >= self.max_retries:
+                    raise
+                self._sleep(attempt, None)
+                attempt += 1
+                continue
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                _truncate(sink)
+                if attempt >= self.max_retries:
+                    raise
+                self._sleep(attempt, None)
+                attempt += 1
+                continue
+            if resp.will_close:
+                conn.close()
+            else:
+                self._checkin(key, conn)
+
+            if status in REDIRECT_STATUSES and "location" in response_headers:
+                redirects += 1
+                if redirects > MAX_REDIRECTS:
+                    raise _http_error(url, status, resp.reason, resp.msg, result)
+                next_url = urllib.parse.urljoin(url, response_headers["location"])
+                if urllib.parse.urlsplit(next_url).netloc != parsed.netloc:
+                    headers = {k: v for k, v in headers.items() if k.lower() != "authorization"}
+                url = next_url
+                continue
+            if status in RETRY_STATUSES and attempt < self.max_retries:
+                self._sleep(attempt, response_headers.get("retry-after"))
+                attempt += 1
+                continue
+            if status >= 400:
+                raise _http_error(url, status, resp.reason, resp.msg, result)
+            return status, response_headers, result
+
+    def _sleep(self, attempt: int, retry_after: str | None) -> None:
+        delay = self.backoff * (2**attempt)
+        if retry_after and retry_after.strip().isdigit():
+            delay = max(delay, float(retry_after.strip()))
+        time.sleep(min(delay, MAX_BACKOFF))
+
+    def _checkout(self, key: tuple[str, str, int]) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            connections = self._idle.get(key)
+            if connections:
+                return connections.pop(), True
+        return self._connect(key), False
+
+    def _checkin(self, key: tuple[str, str, int], conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            connections = self._idle.setdefault(key, [])
+            if len(connections) < self.max_idle_per_host:
+                connections.append(conn)
+                return
+        conn.close()
+
+    def _connect(self, key: tuple[str, str, int]) -> http.client.HTTPConnection:
+        import http.client
+        import ssl
+
+        scheme, host, port = key
+        proxy = _proxy_for(scheme, host)
+        if scheme == "https":
+            if self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+            if proxy:
+                conn = http.client.HTTPSConnection(
+                    proxy[0], proxy[1], timeout=self.timeout, context=self._ssl_context
+                )
+                conn.set_tunnel(host, port)
+                return conn
+            return http.client.HTTPSConnection(
+                host, port, timeout=self.timeout, context=self._ssl_context
+            )
+        if proxy:
+            return http.client.HTTPConnection(proxy[0], proxy[1], timeout=self.timeout)
+        return http.client.HTTPConnection(host, port, timeout=self.timeout)
+
+
+def _connection_key(parsed: urllib.parse.SplitResult) -> tuple[str, str, int]:
+    scheme = parsed.scheme.lower()
+    if scheme not in ("http", "https"):
+        raise ValueError(f"Unsupported URL scheme: {parsed.scheme}")
+    port = parsed.port or (443 if scheme == "https" else 80)
+    return scheme, parsed.hostname or "", port
+
+
+def _proxy_for(scheme: str, host: str) -> tuple[str, int] | None:
+    import urllib.parse
+    import urllib.request
+
+    proxy_url = urllib.request.getproxies().get(scheme)
+    if not proxy_url or urllib.request.proxy_bypass(host):
+        return None
+    parsed = urllib.parse.urlsplit(proxy_url if "://" in proxy_url else f"http://{proxy_url}")
+    return parsed.hostname or "", parsed.port or 80
+
+
+def _read_body(
+    resp: http.client.HTTPResponse,
+    headers: dict[str, str],
+    sink: io.BufferedWriter | None,
+):
+    import zlib
+
+    gzipped = headers.get("content-encoding", "").lower() == "gzip"
+    if sink is None:
+        body = resp.read()
+        return zlib.decompress(body, 16 + zlib.MAX_WBITS) if gzipped else body
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS) if gzipped else None
+    written = 0
+    while True:
+        chunk = resp.read(DOWNLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        if decoder is not None:
+            chunk = decoder.decompress(chunk)
+        sink.write(chunk)
+        written += len(chunk)
+    if decoder is not None:
+        tail = decoder.flush()
+        sink.write(tail)
+        written += len(tail)
+    return written
+
+
+def _truncate(sink: io.BufferedWriter | None) -> None:
+    if sink is not None:
+        sink.seek(0)
+        sink.truncate()
+
+
+def _http_error(url: str, status: int, reason: str, msg, body: bytes) -> urllib.error.HTTPError:
+    import urllib.error
+
+    return urllib.error.HTTPError(url, status, reason, msg, io.BytesIO(body))
+
+
+_default_client: HttpClient | None = None
+_default_client_lock = threading.Lock()
+
+
+def default_client() -> HttpClient:
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = HttpClient()
+        return _default_client
+
+
+def set_default_client(client: HttpClient) -> None:
+    global _default_client
+    with _default_client_lock:
+        _default_client = client
+
+
+def _github_headers(user_agent: str, extra_headers: dict[str, str] | None) -> dict[str, str]:
     headers = {"User-Agent": user_agent}
+    if extra_headers:
+        headers.update(extra_headers)
     token = os.environ.get("GITHUB_TOKEN") or os.environ.get("GH_TOKEN")
     if token:
         headers["Authorization"] = f"token {token}"
-    req = urllib.request.Request(url, headers=headers)
-    with urllib.request.urlopen(req) as resp:
-        return resp.read()
+    return headers
+
+
+def github_request(
+    url: str, user_agent: str, extra_headers: dict[str, str] | None = None
+) -> bytes:
+    return default_client().request(url, _github_headers(user_agent, extra_headers)).body
+
+
+def github_download(url: str, user_agent: str, dest_path: str) -> int:
+    """Stream a response body to dest_path in chunks and return the byte count."""
+    return default_client().download(url, dest_path, _github_headers(user_agent, None))
+
+
+class ResponseCache:
+    """On-disk cache of GitHub API responses keyed by URL and credentials.
+
+    Entries keep the ETag/Last-Modified validators next to the body. Within the
+    TTL the cached body is returned without a request; after it, the entry is
+    revalidated with a conditional request, and a 304 refreshes the entry.
+    """
+
+    def __init__(self, root: str, ttl: float = DEFAULT_CACHE_TTL) -> None:
+        self.root = root
+        self.ttl = ttl
+
+    def _path(self, url: str, headers: dict[str, str]) -> str:
+        import hashlib
+
+        # Different tokens can see different content, so they get separate entries.
+        key = f"{headers.get('Authorization', '')}\n{url}"
+        return os.path.join(self.root, hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, url: str, headers: dict[str, str]) -> dict | None:
+        import json
+
+        try:
+            with open(self._path(url, headers), "r", encoding="utf-8") as file_handle:
+                entry = json.load(file_handle)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or entry.get("url") != url:
+            return None
+        return entry
+
+    def is_fresh(self, entry: dict) -> bool:
+        return time.time() - float(entry.get("fetched_at", 0)) < self.ttl
+
+    def put(self, url: str, headers: dict[str, str], response: HttpResponse) -> dict:
+        entry = {
+            "url": url,
+            "fetched_at": time.time(),
+            "etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified"),
+            "body": response.body.decode("utf-8"),
+        }
+        self._write(self._path(url, headers), entry)
+        return entry
+
+    def refresh(self, url: str, headers: dict[str, str], entry: dict, response: HttpResponse) -> None:
+        entry["fetched_at"] = time.time()
+        entry["etag"] = response.headers.get("etag") or entry.get("etag")
+        entry["last_modified"] = response.headers.get("last-modified") or entry.get("last_modified")
+        self._write(self._path(url, headers), entry)
+
+    def _write(self, path: str, entry: dict) -> None:
+        import json
+
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file_handle:
+            json.dump(entry, file_handle)
+        os.replace(tmp_path, path)
+
+
+def github_request_cached(
+    url: str,
+    user_agent: str,
+    cache: ResponseCache | None,
+    extra_headers: dict[str, str] | None = None,
+) -> bytes:
+    """Like github_request, but served from and revalidated against cache."""
+    if cache is None:
+        return github_request(url, user_agent, extra_headers)
+    headers = _github_headers(user_agent, extra_headers)
+    entry = cache.get(url, headers)
+    if entry is not None and cache.is_fresh(entry):
+        return entry["body"].encode("utf-8")
+    request_headers = dict(headers)
+    if entry is not None:
+        if entry.get("etag"):
+            request_headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            request_headers["If-Modified-Since"] = entry["last_modified"]
+    response = default_client().request(url, request_headers)
+    if response.status == 304 and entry is not None:
+        cache.refresh(url, headers, entry, response)
+        return entry["body"].encode("utf-8")
+    cache.put(url, headers, response)
+    return response.body
 
 
 def github_api_contents_url(repo: str, path: str, ref: str) -> str:
     return f"https://api.github.com/repos/{repo}/contents/{path}?ref={ref}"
+
+
+def github_api_commit_url(repo: str, ref: str) -> str:
+    return f"https://api.github.com/repos/{repo}/commits/{ref}"
+
+
+def github_api_tree_url(repo: str, ref: str, recursive: bool = True) -> str:
+    suffix = "?recursive=1" if recursive else ""
+    return f"https://api.github.com/repos/{repo}/git/trees/{ref}{suffix}"
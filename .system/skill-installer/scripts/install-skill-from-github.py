@@ -4,18 +4,38 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
 from dataclasses import dataclass
+import hashlib
+import json
 import os
+import posixpath
+import re
 import shutil
-import subprocess
 import sys
-import tempfile
-import urllib.error
-import urllib.parse
-import zipfile
+import threading
+import time
 
-from github_utils import github_request
+from github_utils import (
+    github_api_commit_url,
+    github_api_tree_url,
+    github_download,
+    github_request,
+)
 DEFAULT_REF = "main"
+DEFAULT_CACHE_MAX_MB = 512
+COMMIT_SHA_RE = re.compile(r"^[0-9a-f]{40}$")
+MANIFEST_NAME = ".skill-install.json"
+LINK_MODES = ("copy", "hardlink", "reflink", "auto")
+LOCKFILE_FETCH_WORKERS = 8
+# Linux FICLONE ioctl: share the source file's extents with the destination.
+FICLONE = 0x40049409
+
+# Archive, subprocess and URL modules are imported in the functions that use
+# them so --help and argument errors return without loading them.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import zipfile
 
 
 @dataclass
@@ -27,6 +47,14 @@ class Args:
     dest: str | None = None
     name: str | None = None
     method: str = "auto"
+    jobs: int = 1
+    offline: bool = False
+    cache_max_mb: int = DEFAULT_CACHE_MAX_MB
+    update: list[str] | None = None
+    link_mode: str = "copy"
+    object_store: str | None = None
+    lockfile: str | None = None
+    lock: str | None = None
 
 
 @dataclass
@@ -36,6 +64,19 @@ class Source:
     ref: str
     paths: list[str]
     repo_url: str | None = None
+    commit: str | None = None
+
+
+@dataclass
+class InstallResult:
+    name: str
+    dest_dir: str
+    seconds: float
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
 
 
 class InstallError(Exception):
@@ -47,16 +88,34 @@ def _codex_home() -> str:
 
 
 def _tmp_root() -> str:
+    import tempfile
+
     base = os.path.join(tempfile.gettempdir(), "codex")
     os.makedirs(base, exist_ok=True)
     return base
 
 
-def _request(url: str) -> bytes:
-    return github_request(url, "codex-skill-install")
+def _archive_cache_dir() -> str:
+    return os.path.join(_codex_home(), "cache", "archives")
+
+
+def _default_object_store() -> str:
+    return os.environ.get("CODEX_SKILL_OBJECT_STORE") or os.path.join(
+        _codex_home(), "cache", "objects"
+    )
+
+
+def _request(url: str, extra_headers: dict[str, str] | None = None) -> bytes:
+    return github_request(url, "codex-skill-install", extra_headers)
+
+
+def _download(url: str, dest_path: str) -> None:
+    github_download(url, "codex-skill-install", dest_path)
 
 
 def _parse_github_url(url: str, default_ref: str) -> tuple[str, str, str, str | None]:
+    import urllib.parse
+
     parsed = urllib.parse.urlparse(url)
     if parsed.netloc != "github.com":
         raise InstallError("Only GitHub URLs are supported for download mode.")
@@ -77,39 +136,268 @@ def _parse_github_url(url: str, default_ref: str) -> tuple[str, str, str, str |
     return owner, repo, ref, subpath or None
 
 
-def _download_repo_zip(owner: str, repo: str, ref: str, dest_dir: str) -> str:
-    zip_url = f"https://codeload.github.com/{owner}/{repo}/zip/{ref}"
-    zip_path = os.path.join(dest_dir, "repo.zip")
+def _resolve_commit_sha(owner: str, repo: str, ref: str) -> str:
+    import urllib.error
+
+    if COMMIT_SHA_RE.match(ref):
+        return ref
+    api_url = github_api_commit_url(f"{owner}/{repo}", ref)
     try:
-        payload = _request(zip_url)
+        payload = _request(api_url, {"Accept": "application/vnd.github.sha"})
     except urllib.error.HTTPError as exc:
-        raise InstallError(f"Download failed: HTTP {exc.code}") from exc
-    with open(zip_path, "wb") as file_handle:
-        file_handle.write(payload)
-    with zipfile.ZipFile(zip_path, "r") as zip_file:
-        _safe_extract_zip(zip_file, dest_dir)
-        top_levels = {name.split("/")[0] for name in zip_file.namelist() if name}
+        raise InstallError(f"Ref resolution failed: HTTP {exc.code}") from exc
+    sha = payload.decode("utf-8").strip()
+    if not COMMIT_SHA_RE.match(sha):
+        raise InstallError(f"Unexpected commit SHA for {owner}/{repo}@{ref}.")
+    return sha
+
+
+def _cache_refs_path() -> str:
+    return os.path.join(_archive_cache_dir(), "refs.json")
+
+
+def _cache_load_refs() -> dict[str, str]:
+    try:
+        with open(_cache_refs_path(), "r", encoding="utf-8") as file_handle:
+            refs = json.load(file_handle)
+    except (OSError, ValueError):
+        return {}
+    return refs if isinstance(refs, dict) else {}
+
+
+def _cache_lookup_ref(owner: str, repo: str, ref: str) -> str | None:
+    if COMMIT_SHA_RE.match(ref):
+        return ref
+    return _cache_load_refs().get(f"{owner}/{repo}@{ref}")
+
+
+# Parallel fetches record refs at the same time; each read-modify-write of
+# refs.json must see the others' entries.
+_cache_refs_lock = threading.Lock()
+
+
+def _cache_store_ref(owner: str, repo: str, ref: str, sha: str) -> None:
+    if ref == sha:
+        return
+    key = f"{owner}/{repo}@{ref}"
+    with _cache_refs_lock:
+        refs = _cache_load_refs()
+        if refs.get(key) == sha:
+            return
+        refs[key] = sha
+        _write_json_atomic(_cache_refs_path(), refs)
+
+
+def _write_json_atomic(path: str, data: object) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file_handle:
+        json.dump(data, file_handle, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _cache_archive_path(sha: str) -> str:
+    return os.path.join(_archive_cache_dir(), f"{sha}.zip")
+
+
+# Cached archives opened by installs in this process, with a reference count
+# per path; eviction leaves them alone until they are released.
+_archives_in_use: dict[str, int] = {}
+_archive_cache_lock = threading.Lock()
+
+
+def _acquire_archive(zip_path: str) -> None:
+    with _archive_cache_lock:
+        _archives_in_use[zip_path] = _archives_in_use.get(zip_path, 0) + 1
+
+
+def _release_archive(zip_path: str) -> None:
+    with _archive_cache_lock:
+        count = _archives_in_use.pop(zip_path, 0) - 1
+        if count > 0:
+            _archives_in_use[zip_path] = count
+
+
+def _cache_get_archive(sha: str) -> str | None:
+    """Return the cached archive for sha, acquired for the caller, or None."""
+    zip_path = _cache_archive_path(sha)
+    with _archive_cache_lock:
+        try:
+            # Bump the mtime so eviction treats the archive as recently used.
+            os.utime(zip_path)
+        except OSError:
+            return None
+        _archives_in_use[zip_path] = _archives_in_use.get(zip_path, 0) + 1
+    return zip_path
+
+
+def _evict_archive_cache(max_bytes: int) -> None:
+    with _archive_cache_lock:
+        cache_dir = _archive_cache_dir()
+        entries = []
+        for name in os.listdir(cache_dir):
+            if not name.endswith(".zip"):
+                continue
+            path = os.path.join(cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= max_bytes:
+                break
+            if path in _archives_in_use:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+
+def _fetch_zip(zip_url: str, zip_path: str) -> None:
+    import urllib.error
+
+    tmp_path = f"{zip_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        _download(zip_url, tmp_path)
+    except BaseException as exc:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        if isinstance(exc, urllib.error.HTTPError):
+            raise InstallError(f"Download failed: HTTP {exc.code}") from exc
+        raise
+    os.replace(tmp_path, zip_path)
+
+
+def _cached_repo_zip(
+    owner: str, repo: str, ref: str, dest_dir: str, offline: bool, cache_max_bytes: int
+) -> tuple[str, str | None]:
+    """Return (archive path, commit SHA); the SHA is None for an uncached fallback download.
+
+    A cached archive is returned acquired; pass it to _release_archive when done.
+    """
+    if offline:
+        sha = _cache_lookup_ref(owner, repo, ref)
+        zip_path = _cache_get_archive(sha) if sha else None
+        if not zip_path:
+            raise InstallError(f"{owner}/{repo}@{ref} is not in the download cache (offline).")
+        return zip_path, sha
+    try:
+        sha = _resolve_commit_sha(owner, repo, ref)
+    except InstallError:
+        # Resolution is best effort; fall back to an uncached download of the ref.
+        zip_path = os.path.join(dest_dir, "repo.zip")
+        _fetch_zip(f"https://codeload.github.com/{owner}/{repo}/zip/{ref}", zip_path)
+        return zip_path, None
+    _cache_store_ref(owner, repo, ref, sha)
+    zip_path = _cache_get_archive(sha)
+    if zip_path:
+        return zip_path, sha
+    zip_path = _cache_archive_path(sha)
+    os.makedirs(os.path.dirname(zip_path), exist_ok=True)
+    _acquire_archive(zip_path)
+    try:
+        _fetch_zip(f"https://codeload.github.com/{owner}/{repo}/zip/{sha}", zip_path)
+        _evict_archive_cache(cache_max_bytes)
+    except BaseException:
+        _release_archive(zip_path)
+        raise
+    return zip_path, sha
+
+
+def _download_repo_zip(
+    owner: str,
+    repo: str,
+    ref: str,
+    dest_dir: str,
+    offline: bool = False,
+    cache_max_bytes: int = DEFAULT_CACHE_MAX_MB * 1024 * 1024,
+    paths: list[str] | None = None,
+) -> tuple[str, str | None]:
+    """Extract the repo archive into dest_dir; return (repo root, commit SHA if known)."""
+    import zipfile
+
+    zip_path, sha = _cached_repo_zip(owner, repo, ref, dest_dir, offline, cache_max_bytes)
+    try:
+        with zipfile.ZipFile(zip_path, "r") as zip_file:
+            _safe_extract_zip(zip_file, dest_dir, paths)
+            top_levels = {name.split("/")[0] for name in zip_file.namelist() if name}
+            # GitHub stores the archived commit SHA as the zip comment.
+            comment = zip_file.comment.decode("ascii", "replace").strip()
+    except zipfile.BadZipFile as exc:
+        if sha is not None:
+            os.remove(zip_path)
+        raise InstallError("Downloaded archive is corrupt.") from exc
+    finally:
+        if sha is not None:
+            _release_archive(zip_path)
     if not top_levels:
         raise InstallError("Downloaded archive was empty.")
     if len(top_levels) != 1:
         raise InstallError("Unexpected archive layout.")
-    return os.path.join(dest_dir, next(iter(top_levels)))
+    if COMMIT_SHA_RE.match(comment):
+        sha = comment
+    return os.path.join(dest_dir, next(iter(top_levels))), sha
+
+
+def _fetch_tree_shas(owner: str, repo: str, commit: str, paths: list[str]) -> dict[str, str]:
+    """Map each skill path to its git tree SHA at commit (best effort, one request)."""
+    import urllib.error
+
+    api_url = github_api_tree_url(f"{owner}/{repo}", commit)
+    try:
+        data = json.loads(_request(api_url).decode("utf-8"))
+    except (urllib.error.URLError, OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or not isinstance(data.get("tree"), list):
+        return {}
+    wanted = {_archive_prefix(path): path for path in paths}
+    return {
+        wanted[item["path"]]: item["sha"]
+        for item in data["tree"]
+        if item.get("type") == "tree" and item.get("path") in wanted
+    }
 
 
-def _run_git(args: list[str]) -> None:
+def _run_git(args: list[str]) -> str:
+    import subprocess
+
     result = subprocess.run(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
     if result.returncode != 0:
         raise InstallError(result.stderr.strip() or "Git command failed.")
+    return result.stdout
+
+
+def _archive_prefix(path: str) -> str:
+    """Normalize a skill path ("./skills/a/", "skills//a") to its form in archive member names."""
+    prefix = posixpath.normpath(path.replace(os.sep, "/")).strip("/")
+    return "" if prefix == "." else prefix
 
 
-def _safe_extract_zip(zip_file: zipfile.ZipFile, dest_dir: str) -> None:
+def _archive_member_selected(name: str, paths: list[str]) -> bool:
+    # Archive members live under a single "<repo>-<ref>/" top-level directory.
+    rel = name.split("/", 1)[1] if "/" in name else ""
+    for path in paths:
+        prefix = _archive_prefix(path)
+        if not prefix or rel == prefix or rel.startswith(prefix + "/"):
+            return True
+    return False
+
+
+def _safe_extract_zip(
+    zip_file: zipfile.ZipFile, dest_dir: str, paths: list[str] | None = None
+) -> None:
     dest_root = os.path.realpath(dest_dir)
     for info in zip_file.infolist():
-        extracted_path = os.path.realpath(os.path.join(dest_dir, info.filename))
-        if extracted_path == dest_root or extracted_path.startswith(dest_root + os.sep):
+        if paths is not None and not _archive_member_selected(info.filename, paths):
             continue
-        raise InstallError("Archive contains files outside the destination.")
-    zip_file.extractall(dest_dir)
+        extracted_path = os.path.realpath(os.path.join(dest_dir, info.filename))
+        if not (extracted_path == dest_root or extracted_path.startswith(dest_root + os.sep)):
+            raise InstallError("Archive contains files outside the destination.")
+        zip_file.extract(info, dest_dir)
 
 
 def _validate_relative_path(path: str) -> None:
@@ -125,39 +413,93 @@ def _validate_skill_name(name: str) -> None:
         raise InstallError("Invalid skill name.")
 
 
+def _git_mirror_root() -> str:
+    return os.path.join(_codex_home(), "cache", "git")
+
+
+def _git_mirror_dir(repo_url: str) -> str:
+    name = re.sub(r"[^A-Za-z0-9._-]+", "-", repo_url.rstrip("/").rsplit("/", 1)[-1])
+    digest = hashlib.sha256(repo_url.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(_git_mirror_root(), f"{digest}-{name.removesuffix('.git')}.git")
+
+
+@contextlib.contextmanager
+def _git_mirror_lock(mirror_dir: str):
+    # Fetches and worktree bookkeeping in one mirror must not interleave
+    # across concurrent installs.
+    os.makedirs(os.path.dirname(mirror_dir), exist_ok=True)
+    with open(f"{mirror_dir}.lock", "a") as lock_file:
+        try:
+            import fcntl
+        except ImportError:
+            yield
+            return
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _ensure_git_mirror(repo_url: str, mirror_dir: str) -> None:
+    if os.path.isdir(mirror_dir):
+        # Drop worktrees left behind by earlier installs whose temp dirs are gone.
+        _run_git(["git", "-C", mirror_dir, "worktree", "prune"])
+        return
+    tmp_dir = f"{mirror_dir}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    try:
+        _run_git(["git", "init", "--quiet", "--bare", tmp_dir])
+        _run_git(["git", "-C", tmp_dir, "config", "remote.origin.url", repo_url])
+        os.replace(tmp_dir, mirror_dir)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
 def _git_sparse_checkout(repo_url: str, ref: str, paths: list[str], dest_dir: str) -> str:
+    """Check out paths at ref via a persistent partial-clone mirror of repo_url.
+
+    The mirror under $CODEX_HOME/cache/git holds commits and trees fetched
+    with --filter=blob:none; each install fetches only new objects, adds a
+    detached sparse worktree in dest_dir and checks out just the requested
+    paths, which pulls in the blobs it is missing.
+    """
+    mirror_dir = _git_mirror_dir(repo_url)
     repo_dir = os.path.join(dest_dir, "repo")
-    clone_cmd = [
-        "git",
-        "clone",
-        "--filter=blob:none",
-        "--depth",
-        "1",
-        "--sparse",
-        "--single-branch",
-        "--branch",
-        ref,
-        repo_url,
-        repo_dir,
-    ]
-    try:
-        _run_git(clone_cmd)
-    except InstallError:
+    with _git_mirror_lock(mirror_dir):
+        _ensure_git_mirror(repo_url, mirror_dir)
         _run_git(
             [
                 "git",
-                "clone",
-                "--filter=blob:none",
+                "-C",
+                mirror_dir,
+                "fetch",
+                "--quiet",
+                "--no-tags",
                 "--depth",
                 "1",
-                "--sparse",
-                "--single-branch",
-                repo_url,
+                "--filter=blob:none",
+                "origin",
+                ref,
+            ]
+        )
+        commit = _run_git(["git", "-C", mirror_dir, "rev-parse", "FETCH_HEAD^{commit}"]).strip()
+        _run_git(
+            [
+                "git",
+                "-C",
+                mirror_dir,
+                "worktree",
+                "add",
+                "--quiet",
+                "--no-checkout",
+                "--detach",
                 repo_dir,
+                commit,
             ]
         )
-    _run_git(["git", "-C", repo_dir, "sparse-checkout", "set", *paths])
-    _run_git(["git", "-C", repo_dir, "checkout", ref])
+        _run_git(["git", "-C", repo_dir, "sparse-checkout", "set", *paths])
+        _run_git(["git", "-C", repo_dir, "checkout", "--quiet", commit])
     return repo_dir
 
 
@@ -169,11 +511,603 @@ def _validate_skill(path: str) -> None:
         raise InstallError("SKILL.md not found in selected skill directory.")
 
 
-def _copy_skill(src: str, dest_dir: str) -> None:
+def _store_blob(store: str, src: str) -> str:
+    """Add src to the content-addressed store (if missing) and return the blob path."""
+    digest = _hash_file(src)
+    executable = os.access(src, os.X_OK)
+    blob = os.path.join(store, digest[:2], digest[2:] + (".x" if executable else ""))
+    if not os.path.exists(blob):
+        os.makedirs(os.path.dirname(blob), exist_ok=True)
+        tmp_path = f"{blob}.{os.getpid()}.{threading.get_ident()}.tmp"
+        shutil.copyfile(src, tmp_path)
+        # Blobs are shared by every hardlinked install, so keep them read-only.
+        os.chmod(tmp_path, 0o555 if executable else 0o444)
+        os.replace(tmp_path, blob)
+    return blob
+
+
+def _reflink(src: str, dest: str) -> None:
+    if sys.platform == "darwin":
+        import subprocess
+
+        result = subprocess.run(["cp", "-c", src, dest], stderr=subprocess.PIPE)
+        if result.returncode != 0:
+            raise OSError("reflink not supported")
+        return
+    try:
+        import fcntl
+    except ImportError as exc:
+        # No ioctl on Windows; callers fall back to a hardlink or copy.
+        raise OSError("reflink not supported on this platform") from exc
+
+    try:
+        with open(src, "rb") as src_handle, open(dest, "wb") as dest_handle:
+            fcntl.ioctl(dest_handle.fileno(), FICLONE, src_handle.fileno())
+    except OSError:
+        if os.path.exists(dest):
+            os.remove(dest)
+        raise
+
+
+def _place_file(src: str, dest: str, link_mode: str, store: str) -> None:
+    if link_mode == "copy":
+        shutil.copy2(src, dest)
+        return
+    blob = _store_blob(store, src)
+    if link_mode in ("reflink", "auto"):
+        try:
+            _reflink(blob, dest)
+            os.chmod(dest, 0o755 if blob.endswith(".x") else 0o644)
+            return
+        except OSError:
+            if link_mode == "reflink":
+                shutil.copy2(src, dest)
+                return
+    try:
+        os.link(blob, dest)
+    except OSError:
+        shutil.copy2(src, dest)
+
+
+def _copy_skill(
+    src: str, dest_dir: str, link_mode: str = "copy", store: str | None = None
+) -> None:
     os.makedirs(os.path.dirname(dest_dir), exist_ok=True)
     if os.path.exists(dest_dir):
         raise InstallError(f"Destination already exists: {dest_dir}")
-    shutil.copytree(src, dest_dir)
+    try:
+        if link_mode == "copy":
+            shutil.copytree(src, dest_dir)
+            return
+        store = store or _default_object_store()
+        for dirpath, _, filenames in os.walk(src):
+            target_dir = os.path.join(dest_dir, os.path.relpath(dirpath, src))
+            os.makedirs(target_dir, exist_ok=True)
+            for filename in filenames:
+                _place_file(
+                    os.path.join(dirpath, filename),
+                    os.path.join(target_dir, filename),
+                    link_mode,
+                    store,
+                )
+    except BaseException:
+        shutil.rmtree(dest_dir, ignore_errors=True)
+        raise
+
+
+def _hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file_handle:
+        for chunk in iter(lambda: file_handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _hash_tree(root: str) -> dict[str, str]:
+    hashes = {}
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            full_path = os.path.join(dirpath, filename)
+            rel_path = os.path.relpath(full_path, root).replace(os.sep, "/")
+            if rel_path == MANIFEST_NAME:
+                continue
+            hashes[rel_path] = _hash_file(full_path)
+    return hashes
+
+
+def _build_manifest(source: Source, path: str, tree_sha: str | None, files: dict[str, str]) -> dict:
+    return {
+        "owner": source.owner,
+        "repo": source.repo,
+        "ref": source.ref,
+        "commit": source.commit,
+        "path": path,
+        "tree": tree_sha,
+        "files": files,
+    }
+
+
+def _read_manifest(skill_dir: str) -> dict | None:
+    try:
+        with open(os.path.join(skill_dir, MANIFEST_NAME), "r", encoding="utf-8") as file_handle:
+            manifest = json.load(file_handle)
+    except (OSError, ValueError):
+        return None
+    required = ("owner", "repo", "ref", "path", "files")
+    if not isinstance(manifest, dict) or any(key not in manifest for key in required):
+        return None
+    return manifest
+
+
+def _plan_installs(
+    source: Source, name: str | None, dest_root: str
+) -> tuple[list[tuple[str, str, str]], list[InstallResult]]:
+    """Return (skills to install, failed results for destinations that already exist).
+
+    Existing destinations are refused here, before anything is downloaded.
+    """
+    planned = []
+    existing = []
+    seen = set()
+    for path in source.paths:
+        skill_name = name if len(source.paths) == 1 else None
+        skill_name = skill_name or os.path.basename(path.rstrip("/"))
+        _validate_skill_name(skill_name)
+        if not skill_name:
+            raise InstallError("Unable to derive skill name.")
+        if skill_name in seen:
+            raise InstallError(f"Duplicate skill name: {skill_name}")
+        seen.add(skill_name)
+        dest_dir = os.path.join(dest_root, skill_name)
+        if os.path.exists(dest_dir):
+            existing.append(
+                InstallResult(skill_name, dest_dir, 0.0, f"Destination already exists: {dest_dir}")
+            )
+            continue
+        planned.append((path, skill_name, dest_dir))
+    return planned, existing
+
+
+def _install_one(
+    repo_root: str,
+    source: Source,
+    tree_shas: dict[str, str],
+    link_mode: str,
+    store: str | None,
+    path: str,
+    skill_name: str,
+    dest_dir: str,
+) -> InstallResult:
+    start = time.monotonic()
+    try:
+        skill_src = os.path.join(repo_root, path)
+        _validate_skill(skill_src)
+        _copy_skill(skill_src, dest_dir, link_mode, store)
+        try:
+            manifest = _build_manifest(source, path, tree_shas.get(path), _hash_tree(dest_dir))
+            _write_json_atomic(os.path.join(dest_dir, MANIFEST_NAME), manifest)
+        except BaseException:
+            shutil.rmtree(dest_dir, ignore_errors=True)
+            raise
+    except (InstallError, OSError) as exc:
+        return InstallResult(skill_name, dest_dir, time.monotonic() - start, str(exc))
+    return InstallResult(skill_name, dest_dir, time.monotonic() - start)
+
+
+def _install_skills(
+    repo_root: str,
+    source: Source,
+    tree_shas: dict[str, str],
+    planned: list[tuple[str, str, str]],
+    jobs: int,
+    link_mode: str = "copy",
+    store: str | None = None,
+) -> list[InstallResult]:
+    common = (repo_root, source, tree_shas, link_mode, store)
+    if jobs <= 1 or len(planned) <= 1:
+        return [_install_one(*common, *item) for item in planned]
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=min(jobs, len(planned))) as pool:
+        futures = [pool.submit(_install_one, *common, *item) for item in planned]
+        return [future.result() for future in futures]
+
+
+def _link_or_copy(src: str, dest: str) -> None:
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    try:
+        os.link(src, dest)
+    except OSError:
+        shutil.copy2(src, dest)
+
+
+def _apply_update(
+    skill_src: str,
+    dest_dir: str,
+    manifest: dict,
+    link_mode: str = "copy",
+    store: str | None = None,
+) -> tuple[int, int]:
+    """Swap dest_dir for the files in skill_src, reusing unchanged files in place.
+
+    Unchanged files are hardlinked from the installed copy and only changed
+    files are copied, into a staging directory that is renamed over dest_dir.
+    Returns (changed, removed) file counts.
+    """
+    old_files = manifest["files"]
+    current_files = _hash_tree(dest_dir)
+    modified = sorted(
+        rel for rel, digest in old_files.items() if current_files.get(rel, digest) != digest
+    )
+    if modified:
+        raise InstallError(f"Local changes would be overwritten: {', '.join(modified)}")
+    new_files = _hash_tree(skill_src)
+    staging_dir = f"{dest_dir}.update-{os.getpid()}"
+    backup_dir = f"{dest_dir}.backup-{os.getpid()}"
+    changed = 0
+    try:
+        for rel, digest in new_files.items():
+            target = os.path.join(staging_dir, rel)
+            if current_files.get(rel) == digest:
+                _link_or_copy(os.path.join(dest_dir, rel), target)
+            else:
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                _place_file(
+                    os.path.join(skill_src, rel),
+                    target,
+                    link_mode,
+                    store or _default_object_store(),
+                )
+                changed += 1
+        # Keep files the user added next to the installed skill.
+        for rel in current_files:
+            if rel not in old_files and rel not in new_files:
+                _link_or_copy(os.path.join(dest_dir, rel), os.path.join(staging_dir, rel))
+        manifest["files"] = new_files
+        _write_json_atomic(os.path.join(staging_dir, MANIFEST_NAME), manifest)
+        os.rename(dest_dir, backup_dir)
+        try:
+            os.rename(staging_dir, dest_dir)
+        except OSError:
+            os.rename(backup_dir, dest_dir)
+            raise
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+    shutil.rmtree(backup_dir, ignore_errors=True)
+    removed = len([rel for rel in old_files if rel not in new_files])
+    return changed, removed
+
+
+def _installed_manifests(dest_root: str, names: list[str]) -> dict[str, dict]:
+    if names:
+        candidates = names
+    elif os.path.isdir(dest_root):
+        candidates = sorted(os.listdir(dest_root))
+    else:
+        candidates = []
+    manifests = {}
+    for name in candidates:
+        _validate_skill_name(name)
+        manifest = _read_manifest(os.path.join(dest_root, name))
+        if manifest is not None:
+            manifests[name] = manifest
+        elif names:
+            raise InstallError(f"{name} has no install manifest; reinstall it to enable updates.")
+    return manifests
+
+
+def _update_group(
+    dest_root: str, skills: dict[str, dict], args: Args, tmp_dir: str
+) -> tuple[list[str], list[str]]:
+    """Update skills installed from one owner/repo@ref.
+
+    Returns (status lines, per-skill failure lines); a skill that cannot be
+    updated does not stop the rest of its group.
+    """
+    first = next(iter(skills.values()))
+    owner, repo, ref = first["owner"], first["repo"], first["ref"]
+    if args.offline:
+        commit = _cache_lookup_ref(owner, repo, ref)
+        if not commit:
+            raise InstallError(f"{owner}/{repo}@{ref} is not in the download cache (offline).")
+    else:
+        commit = _resolve_commit_sha(owner, repo, ref)
+    lines = []
+    failures = []
+    stale = {name: manifest for name, manifest in skills.items() if manifest.get("commit") != commit}
+    for name in skills:
+        if name not in stale:
+            lines.append(f"{name} is up to date")
+    if not stale:
+        return lines, failures
+    tree_shas = {} if args.offline else _fetch_tree_shas(
+        owner, repo, commit, [manifest["path"] for manifest in stale.values()]
+    )
+    changed = {}
+    for name, manifest in stale.items():
+        tree_sha = tree_shas.get(manifest["path"])
+        if tree_sha and tree_sha == manifest.get("tree"):
+            manifest["commit"] = commit
+            _write_json_atomic(os.path.join(dest_root, name, MANIFEST_NAME), manifest)
+            lines.append(f"{name} is up to date")
+        else:
+            manifest["commit"] = commit
+            manifest["tree"] = tree_sha
+            changed[name] = manifest
+    if not changed:
+        return lines, failures
+    source = Source(
+        owner=owner,
+        repo=repo,
+        ref=commit,
+        paths=sorted({manifest["path"] for manifest in changed.values()}),
+    )
+    repo_root = _prepare_repo(
+        source, args.method, tmp_dir, args.offline, args.cache_max_mb * 1024 * 1024
+    )
+    for name, manifest in changed.items():
+        skill_src = os.path.join(repo_root, manifest["path"])
+        try:
+            _validate_skill(skill_src)
+            files_changed, files_removed = _apply_update(
+                skill_src, os.path.join(dest_root, name), manifest, args.link_mode, args.object_store
+            )
+        except (InstallError, OSError) as exc:
+            failures.append(f"Failed to update {name}: {exc}")
+            continue
+        lines.append(f"Updated {name} ({files_changed} changed, {files_removed} removed)")
+    return lines, failures
+
+
+def _run_update(args: Args) -> int:
+    import tempfile
+
+    dest_root = args.dest or _default_dest()
+    manifests = _installed_manifests(dest_root, args.update or [])
+    if not manifests:
+        raise InstallError(f"No updatable skills found in {dest_root}.")
+    groups: dict[tuple[str, str, str], dict[str, dict]] = {}
+    for name, manifest in manifests.items():
+        key = (manifest["owner"], manifest["repo"], manifest["ref"])
+        groups.setdefault(key, {})[name] = manifest
+    failed = False
+    for (owner, repo, ref), skills in groups.items():
+        tmp_dir = tempfile.mkdtemp(prefix="skill-update-", dir=_tmp_root())
+        try:
+            lines, failures = _update_group(dest_root, skills, args, tmp_dir)
+            for line in lines:
+                print(line)
+            for line in failures:
+                failed = True
+                print(line, file=sys.stderr)
+        except (InstallError, OSError) as exc:
+            failed = True
+            print(f"Failed to update {owner}/{repo}@{ref}: {exc}", file=sys.stderr)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    return 1 if failed else 0
+
+
+def _load_lockfile(path: str) -> list[dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as file_handle:
+            data = json.load(file_handle)
+    except OSError as exc:
+        raise InstallError(f"Cannot read lockfile {path}: {exc}") from exc
+    except ValueError as exc:
+        raise InstallError(f"Lockfile {path} is not valid JSON: {exc}") from exc
+    entries = data.get("skills") if isinstance(data, dict) else data
+    if not isinstance(entries, list) or not entries:
+        raise InstallError("Lockfile must contain a non-empty list of skills.")
+    for index, entry in enumerate(entries):
+        if not (
+            isinstance(entry, dict)
+            and isinstance(entry.get("repo"), str)
+            and isinstance(entry.get("path"), str)
+        ):
+            raise InstallError(f"Lockfile entry {index} needs string 'repo' and 'path' fields.")
+        for field in ("name", "ref", "commit"):
+            if entry.get(field) is not None and not isinstance(entry[field], str):
+                raise InstallError(f"Lockfile entry {index} field '{field}' must be a string.")
+    return entries
+
+
+def _plan_lockfile(
+    entries: list[dict], dest_root: str
+) -> list[tuple[Source, list[tuple[str, str, str]]]]:
+    """Group lockfile entries into one Source per repo@ref, with planned installs."""
+    groups: dict[tuple[str, str, str], tuple[Source, list[tuple[str, str, str]]]] = {}
+    seen = set()
+    for entry in entries:
+        repo_parts = [part for part in entry["repo"].split("/") if part]
+        if len(repo_parts) != 2:
+            raise InstallError(f"Lockfile repo must be in owner/repo format: {entry['repo']}")
+        path = entry["path"]
+        _validate_relative_path(path)
+        skill_name = entry.get("name") or os.path.basename(path.rstrip("/"))
+        _validate_skill_name(skill_name)
+        if skill_name in seen:
+            raise InstallError(f"Duplicate skill name: {skill_name}")
+        seen.add(skill_name)
+        dest_dir = os.path.join(dest_root, skill_name)
+        if os.path.exists(dest_dir):
+            raise InstallError(f"Destination already exists: {dest_dir}")
+        ref = entry.get("ref") or DEFAULT_REF
+        commit = entry.get("commit")
+        if commit is not None:
+            if not isinstance(commit, str) or not COMMIT_SHA_RE.match(commit):
+                raise InstallError(f"Lockfile commit must be a 40-character SHA: {commit}")
+            # Pinned entries fetch by SHA, so archive URLs and cache keys are immutable.
+            ref = commit
+        key = (repo_parts[0], repo_parts[1], ref)
+        if key not in groups:
+            groups[key] = (Source(owner=repo_parts[0], repo=repo_parts[1], ref=ref, paths=[]), [])
+        source, planned = groups[key]
+        source.paths.append(path)
+        planned.append((path, skill_name, dest_dir))
+    return list(groups.values())
+
+
+def _stage_source(
+    source: Source,
+    planned: list[tuple[str, str, str]],
+    staging_root: str,
+    tmp_dir: str,
+    args: Args,
+) -> list[InstallResult]:
+    """Fetch one repo@ref and install its skills into staging_root."""
+    start = time.monotonic()
+    staged = [(path, name, os.path.join(staging_root, name)) for path, name, _ in planned]
+    try:
+        repo_root = _prepare_repo(
+            source, args.method, tmp_dir, args.offline, args.cache_max_mb * 1024 * 1024
+        )
+    except (InstallError, OSError) as exc:
+        error = f"{source.owner}/{source.repo}@{source.ref}: {exc}"
+        return [
+            InstallResult(name, dest_dir, time.monotonic() - start, error)
+            for _, name, dest_dir in staged
+        ]
+    tree_shas = {}
+    if source.commit and not args.offline:
+        tree_shas = _fetch_tree_shas(source.owner, source.repo, source.commit, source.paths)
+    return _install_skills(
+        repo_root, source, tree_shas, staged, args.jobs, args.link_mode, args.object_store
+    )
+
+
+def _commit_staged(moves: list[tuple[str, str]]) -> None:
+    """Rename every staged skill into place, or move the ones already renamed back."""
+    moved = []
+    try:
+        for staged_dir, dest_dir in moves:
+            if os.path.exists(dest_dir):
+                raise InstallError(f"Destination already exists: {dest_dir}")
+            os.rename(staged_dir, dest_dir)
+            moved.append((staged_dir, dest_dir))
+    except BaseException:
+        for staged_dir, dest_dir in reversed(moved):
+            os.rename(dest_dir, staged_dir)
+        raise
+
+
+def _install_lockfile(args: Args) -> list[InstallResult]:
+    """Install every skill in the lockfile, or none of them.
+
+    Each repo@ref is fetched and extracted in parallel into a staging
+    directory inside the destination; the skills are renamed into place only
+    once all of them staged successfully.
+    """
+    import tempfile
+    from concurrent.futures import ThreadPoolExecutor
+
+    if args.url or args.repo:
+        raise InstallError("--lockfile cannot be combined with --repo or --url.")
+    dest_root = args.dest or _default_dest()
+    groups = _plan_lockfile(_load_lockfile(args.lockfile), dest_root)
+    os.makedirs(dest_root, exist_ok=True)
+    # Staging inside dest_root keeps the final renames on one filesystem.
+    staging_root = tempfile.mkdtemp(prefix=".skill-install-", dir=dest_root)
+    tmp_dir = tempfile.mkdtemp(prefix="skill-install-", dir=_tmp_root())
+    try:
+        with ThreadPoolExecutor(max_workers=min(LOCKFILE_FETCH_WORKERS, len(groups))) as pool:
+            futures = [
+                pool.submit(
+                    _stage_source,
+                    source,
+                    planned,
+                    staging_root,
+                    tempfile.mkdtemp(dir=tmp_dir),
+                    args,
+                )
+                for source, planned in groups
+            ]
+            staged = [result for future in futures for result in future.result()]
+        error = None
+        if all(result.ok for result in staged):
+            try:
+                _commit_staged(
+                    [(result.dest_dir, os.path.join(dest_root, result.name)) for result in staged]
+                )
+            except (InstallError, OSError) as exc:
+                error = f"Rolled back: {exc}"
+        else:
+            error = "Rolled back: another skill in the lockfile failed"
+        return [
+            InstallResult(
+                result.name,
+                os.path.join(dest_root, result.name),
+                result.seconds,
+                result.error or error,
+            )
+            for result in staged
+        ]
+    finally:
+        shutil.rmtree(staging_root, ignore_errors=True)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _lock_entries(args: Args) -> list[dict]:
+    if args.lockfile:
+        return _load_lockfile(args.lockfile)
+    source = _resolve_source(args)
+    for path in source.paths:
+        _validate_relative_path(path)
+    entries = []
+    for path in source.paths:
+        entry = {"repo": f"{source.owner}/{source.repo}", "path": path, "ref": source.ref}
+        if args.name and len(source.paths) == 1:
+            entry["name"] = args.name
+        entries.append(entry)
+    return entries
+
+
+def _run_lock(args: Args) -> int:
+    """Resolve every ref to a commit SHA and write a pinned lockfile."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    if args.offline:
+        raise InstallError("--lock resolves refs over the network; it cannot run --offline.")
+    entries = _lock_entries(args)
+
+    def key(entry: dict) -> tuple[str, str, str]:
+        parts = [part for part in entry["repo"].split("/") if part]
+        if len(parts) != 2:
+            raise InstallError(f"Lockfile repo must be in owner/repo format: {entry['repo']}")
+        return parts[0], parts[1], entry.get("ref") or DEFAULT_REF
+
+    keys = [key(entry) for entry in entries]
+    refs = sorted(set(keys))
+
+    def resolve(owner: str, name: str, ref: str) -> tuple[str | None, str | None]:
+        try:
+            return _resolve_commit_sha(owner, name, ref), None
+        except (InstallError, OSError) as exc:
+            return None, str(exc)
+
+    # Each distinct repo@ref is resolved once, concurrently.
+    with ThreadPoolExecutor(max_workers=min(LOCKFILE_FETCH_WORKERS, len(refs))) as pool:
+        resolved = dict(zip(refs, pool.map(lambda item: resolve(*item), refs)))
+    failed = False
+    # Status goes to stderr so `--lock -` leaves only the lockfile on stdout.
+    for (owner, name, ref), (commit, error) in resolved.items():
+        if error:
+            failed = True
+            print(f"Failed to resolve {owner}/{name}@{ref}: {error}", file=sys.stderr)
+        else:
+            print(f"Locked {owner}/{name}@{ref} to {commit}", file=sys.stderr)
+    if failed:
+        return 1
+    locked = []
+    for entry, entry_key in zip(entries, keys):
+        commit, _ = resolved[entry_key]
+        locked.append({**entry, "ref": entry_key[2], "commit": commit})
+    if args.lock == "-":
+        print(json.dumps({"skills": locked}, indent=2, sort_keys=True))
+    else:
+        _write_json_atomic(os.path.abspath(args.lock), {"skills": locked})
+        print(f"Wrote {len(locked)} pinned skill(s) to {args.lock}")
+    return 0
 
 
 def _build_repo_url(owner: str, repo: str) -> str:
@@ -184,12 +1118,29 @@ def _build_repo_ssh(owner: str, repo: str) -> str:
     return f"git@github.com:{owner}/{repo}.git"
 
 
-def _prepare_repo(source: Source, method: str, tmp_dir: str) -> str:
+def _prepare_repo(
+    source: Source,
+    method: str,
+    tmp_dir: str,
+    offline: bool = False,
+    cache_max_bytes: int = DEFAULT_CACHE_MAX_MB * 1024 * 1024,
+) -> str:
+    if offline and method == "git":
+        raise InstallError("--offline installs only from the download cache.")
     if method in ("download", "auto"):
         try:
-            return _download_repo_zip(source.owner, source.repo, source.ref, tmp_dir)
+            repo_root, source.commit = _download_repo_zip(
+                source.owner,
+                source.repo,
+                source.ref,
+                tmp_dir,
+                offline,
+                cache_max_bytes,
+                source.paths,
+            )
+            return repo_root
         except InstallError as exc:
-            if method == "download":
+            if method == "download" or offline:
                 raise
             err_msg = str(exc)
             if "HTTP 401" in err_msg or "HTTP 403" in err_msg or "HTTP 404" in err_msg:
@@ -199,10 +1150,12 @@ def _prepare_repo(source: Source, method: str, tmp_dir: str) -> str:
     if method in ("git", "auto"):
         repo_url = source.repo_url or _build_repo_url(source.owner, source.repo)
         try:
-            return _git_sparse_checkout(repo_url, source.ref, source.paths, tmp_dir)
+            repo_root = _git_sparse_checkout(repo_url, source.ref, source.paths, tmp_dir)
         except InstallError:
             repo_url = _build_repo_ssh(source.owner, source.repo)
-            return _git_sparse_checkout(repo_url, source.ref, source.paths, tmp_dir)
+            repo_root = _git_sparse_checkout(repo_url, source.ref, source.paths, tmp_dir)
+        source.commit = _run_git(["git", "-C", repo_root, "rev-parse", "HEAD"]).strip()
+        return repo_root
     raise InstallError("Unsupported method.")
 
 
@@ -244,6 +1197,16 @@ def _default_dest() -> str:
     return os.path.join(_codex_home(), "skills")
 
 
+def _positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"invalid integer: {value}") from exc
+    if number < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return number
+
+
 def _parse_args(argv: list[str]) -> Args:
     parser = argparse.ArgumentParser(description="Install a skill from GitHub.")
     parser.add_argument("--repo", help="owner/repo")
@@ -263,42 +1226,111 @@ def _parse_args(argv: list[str]) -> Args:
         choices=["auto", "download", "git"],
         default="auto",
     )
+    parser.add_argument(
+        "--jobs",
+        type=_positive_int,
+        default=1,
+        help="Number of skills to copy and validate in parallel (default: 1)",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Install only from the local download cache, without network access",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=_positive_int,
+        default=DEFAULT_CACHE_MAX_MB,
+        help=f"Size bound for the download cache in MB (default: {DEFAULT_CACHE_MAX_MB})",
+    )
+    parser.add_argument(
+        "--update",
+        nargs="*",
+        metavar="NAME",
+        help="Update installed skills in place (all skills with an install manifest by default)",
+    )
+    parser.add_argument(
+        "--link-mode",
+        choices=LINK_MODES,
+        default="copy",
+        help="copy files, or share them from the object store via hardlink/reflink "
+        "(auto tries reflink, then hardlink, then copy)",
+    )
+    parser.add_argument(
+        "--object-store",
+        help="Content-addressed blob store for linked installs "
+        "(default: $CODEX_SKILL_OBJECT_STORE or $CODEX_HOME/cache/objects)",
+    )
+    parser.add_argument(
+        "--lockfile",
+        help="JSON list of {repo, path, ref, name, commit} skills to install together, "
+        "all or nothing",
+    )
+    parser.add_argument(
+        "--lock",
+        metavar="OUTPUT",
+        help="Resolve the requested refs to commit SHAs and write a pinned lockfile "
+        "instead of installing ('-' for stdout)",
+    )
     return parser.parse_args(argv, namespace=Args())
 
 
+def install(args: Args) -> list[InstallResult]:
+    import tempfile
+
+    if args.lockfile:
+        return _install_lockfile(args)
+    source = _resolve_source(args)
+    source.ref = source.ref or args.ref
+    if not source.paths:
+        raise InstallError("No skill paths provided.")
+    for path in source.paths:
+        _validate_relative_path(path)
+    dest_root = args.dest or _default_dest()
+    planned, existing = _plan_installs(source, args.name, dest_root)
+    if not planned:
+        return existing
+    # Only fetch and extract the skills that will actually be installed.
+    source.paths = [path for path, _, _ in planned]
+    tmp_dir = tempfile.mkdtemp(prefix="skill-install-", dir=_tmp_root())
+    try:
+        repo_root = _prepare_repo(
+            source, args.method, tmp_dir, args.offline, args.cache_max_mb * 1024 * 1024
+        )
+        tree_shas = {}
+        if source.commit and not args.offline:
+            tree_shas = _fetch_tree_shas(source.owner, source.repo, source.commit, source.paths)
+        return existing + _install_skills(
+            repo_root,
+            source,
+            tree_shas,
+            planned,
+            args.jobs,
+            args.link_mode,
+            args.object_store,
+        )
+    finally:
+        if os.path.isdir(tmp_dir):
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
 def main(argv: list[str]) -> int:
     args = _parse_args(argv)
     try:
-        source = _resolve_source(args)
-        source.ref = source.ref or args.ref
-        if not source.paths:
-            raise InstallError("No skill paths provided.")
-        for path in source.paths:
-            _validate_relative_path(path)
-        dest_root = args.dest or _default_dest()
-        tmp_dir = tempfile.mkdtemp(prefix="skill-install-", dir=_tmp_root())
-        try:
-            repo_root = _prepare_repo(source, args.method, tmp_dir)
-            installed = []
-            for path in source.paths:
-                skill_name = args.name if len(source.paths) == 1 else None
-                skill_name = skill_name or os.path.basename(path.rstrip("/"))
-                _validate_skill_name(skill_name)
-                if not skill_name:
-                    raise InstallError("Unable to derive skill name.")
-                dest_dir = os.path.join(dest_root, skill_name)
-                if os.path.exists(dest_dir):
-                    raise InstallError(f"Destination already exists: {dest_dir}")
-                skill_src = os.path.join(repo_root, path)
-                _validate_skill(skill_src)
-                _copy_skill(skill_src, dest_dir)
-                installed.append((skill_name, dest_dir))
-        finally:
-            if os.path.isdir(tmp_dir):
-                shutil.rmtree(tmp_dir, ignore_errors=True)
-        for skill_name, dest_dir in installed:
-            print(f"Installed {skill_name} to {dest_dir}")
-        return 0
+        if args.update is not None:
+            return _run_update(args)
+        if args.lock:
+            return _run_lock(args)
+        results = install(args)
+        for result in results:
+            if result.ok:
+                print(f"Installed {result.name} to {result.dest_dir} ({result.seconds:.2f}s)")
+            else:
+                print(
+                    f"Failed {result.name}: {result.error} ({result.seconds:.2f}s)",
+                    file=sys.stderr,
+                )
+        return 0 if all(result.ok for result in results) else 1
     except InstallError as exc:
         print(f"Error: {exc}", file=sys.stderr)
         return 1
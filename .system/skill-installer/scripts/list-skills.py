@@ -7,13 +7,24 @@ import argparse
 import json
 import os
 import sys
-import urllib.error
+import time
 
-from github_utils import github_api_contents_url, github_request
+from github_utils import (
+    DEFAULT_CACHE_TTL,
+    ResponseCache,
+    github_api_contents_url,
+    github_api_tree_url,
+    github_request_cached,
+)
 
 DEFAULT_REPO = "openai/skills"
 DEFAULT_PATH = "skills/.curated"
 DEFAULT_REF = "main"
+DEFAULT_CONCURRENCY = 8
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import asyncio
 
 
 class ListError(Exception):
@@ -25,16 +36,27 @@ class Args(argparse.Namespace):
     path: str
     ref: str
     format: str
-
-
-def _request(url: str) -> bytes:
-    return github_request(url, "codex-skill-list")
+    no_cache: bool
+    cache_ttl: float
+    manifest: str | None
+    concurrency: int
+    recursive: bool
 
 
 def _codex_home() -> str:
     return os.environ.get("CODEX_HOME", os.path.expanduser("~/.codex"))
 
 
+def _response_cache(args: Args) -> ResponseCache | None:
+    if args.no_cache:
+        return None
+    return ResponseCache(os.path.join(_codex_home(), "cache", "http"), args.cache_ttl)
+
+
+def _request(url: str, cache: ResponseCache | None = None) -> bytes:
+    return github_request_cached(url, "codex-skill-list", cache)
+
+
 def _installed_skills() -> set[str]:
     root = os.path.join(_codex_home(), "skills")
     if not os.path.isdir(root):
@@ -47,10 +69,14 @@ def _installed_skills() -> set[str]:
     return entries
 
 
-def _list_skills(repo: str, path: str, ref: str) -> list[str]:
+def _list_skills(
+    repo: str, path: str, ref: str, cache: ResponseCache | None = None
+) -> list[str]:
+    import urllib.error
+
     api_url = github_api_contents_url(repo, path, ref)
     try:
-        payload = _request(api_url)
+        payload = _request(api_url, cache)
     except urllib.error.HTTPError as exc:
         if exc.code == 404:
             raise ListError(
@@ -65,6 +91,151 @@ def _list_skills(repo: str, path: str, ref: str) -> list[str]:
     return sorted(skills)
 
 
+def _build_skill_index(tree: list[dict]) -> set[str]:
+    """Return every directory in a git tree listing that contains a SKILL.md."""
+    index = set()
+    for item in tree:
+        if item.get("type") != "blob":
+            continue
+        item_path = item.get("path", "")
+        if item_path == "SKILL.md" or item_path.endswith("/SKILL.md"):
+            index.add(item_path[: -len("SKILL.md")].rstrip("/"))
+    return index
+
+
+def _discover_skills(
+    repo: str, path: str, ref: str, cache: ResponseCache | None = None
+) -> list[str]:
+    import urllib.error
+
+    api_url = github_api_tree_url(repo, ref)
+    try:
+        payload = _request(api_url, cache)
+    except urllib.error.HTTPError as exc:
+        if exc.code == 404:
+            raise ListError(f"Ref not found: https://github.com/{repo}/tree/{ref}") from exc
+        raise ListError(f"Failed to fetch skills: HTTP {exc.code}") from exc
+    data = json.loads(payload.decode("utf-8"))
+    if not isinstance(data, dict) or not isinstance(data.get("tree"), list):
+        raise ListError("Unexpected tree listing response.")
+    if data.get("truncated"):
+        raise ListError("Repository tree is too large to list recursively.")
+    prefix = path.strip("/")
+    prefix = f"{prefix}/" if prefix else ""
+    skills = [
+        skill_dir[len(prefix) :]
+        for skill_dir in _build_skill_index(data["tree"])
+        if skill_dir.startswith(prefix) and skill_dir != prefix.rstrip("/")
+    ]
+    return sorted(skills)
+
+
+def _is_installed(name: str, installed: set[str]) -> bool:
+    return os.path.basename(name) in installed
+
+
+def _load_manifest(path: str, args: Args) -> list[dict[str, str]]:
+    try:
+        if path == "-":
+            data = json.load(sys.stdin)
+        else:
+            with open(path, "r", encoding="utf-8") as file_handle:
+                data = json.load(file_handle)
+    except (OSError, ValueError) as exc:
+        raise ListError(f"Unable to read manifest: {exc}") from exc
+    if isinstance(data, dict):
+        data = data.get("sources")
+    if not isinstance(data, list):
+        raise ListError("Manifest must be a list of sources or {\"sources\": [...]}.")
+    sources = []
+    for item in data:
+        if not isinstance(item, dict):
+            raise ListError("Each manifest source must be an object.")
+        sources.append(
+            {
+                "repo": str(item.get("repo") or args.repo),
+                "path": str(item.get("path") or args.path),
+                "ref": str(item.get("ref") or args.ref),
+            }
+        )
+    return sources
+
+
+async def _list_source(
+    source: dict[str, str],
+    cache: ResponseCache | None,
+    installed: set[str],
+    semaphore: asyncio.Semaphore,
+    recursive: bool,
+) -> dict:
+    import asyncio
+
+    lister = _discover_skills if recursive else _list_skills
+    async with semaphore:
+        start = time.monotonic()
+        skills: list[str] = []
+        error = None
+        try:
+            skills = await asyncio.to_thread(
+                lister, source["repo"], source["path"], source["ref"], cache
+            )
+        except (ListError, OSError, ValueError) as exc:
+            error = str(exc)
+        latency_ms = round((time.monotonic() - start) * 1000, 1)
+    return {
+        **source,
+        "skills": [
+            {"name": name, "installed": _is_installed(name, installed)} for name in skills
+        ],
+        "latency_ms": latency_ms,
+        "error": error,
+    }
+
+
+async def _list_batch(
+    sources: list[dict[str, str]],
+    cache: ResponseCache | None,
+    concurrency: int,
+    recursive: bool = False,
+) -> list[dict]:
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+    # Size the thread pool to the cap so to_thread never becomes the bottleneck.
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=concurrency))
+    installed = _installed_skills()
+    semaphore = asyncio.Semaphore(concurrency)
+    return await asyncio.gather(
+        *(_list_source(source, cache, installed, semaphore, recursive) for source in sources)
+    )
+
+
+def _run_batch(args: Args) -> int:
+    import asyncio
+
+    sources = _load_manifest(args.manifest, args)
+    start = time.monotonic()
+    results = asyncio.run(
+        _list_batch(sources, _response_cache(args), args.concurrency, args.recursive)
+    )
+    document = {
+        "sources": results,
+        "elapsed_ms": round((time.monotonic() - start) * 1000, 1),
+    }
+    print(json.dumps(document))
+    return 1 if any(result["error"] for result in results) else 0
+
+
+def _positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"invalid integer: {value}") from exc
+    if number < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return number
+
+
 def _parse_args(argv: list[str]) -> Args:
     parser = argparse.ArgumentParser(description="List skills.")
     parser.add_argument("--repo", default=DEFAULT_REPO)
@@ -80,22 +251,51 @@ def _parse_args(argv: list[str]) -> Args:
         default="text",
         help="Output format",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the on-disk API response cache",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=DEFAULT_CACHE_TTL,
+        help="Seconds to reuse a cached listing before revalidating it (default: 300)",
+    )
+    parser.add_argument(
+        "--manifest",
+        help="JSON list of {repo, path, ref} sources to list concurrently ('-' for stdin)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=_positive_int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Maximum sources fetched at once with --manifest (default: {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--recursive",
+        action="store_true",
+        help="Find nested skills (any directory with SKILL.md) in one tree request",
+    )
     return parser.parse_args(argv, namespace=Args())
 
 
 def main(argv: list[str]) -> int:
     args = _parse_args(argv)
     try:
-        skills = _list_skills(args.repo, args.path, args.ref)
+        if args.manifest:
+            return _run_batch(args)
+        lister = _discover_skills if args.recursive else _list_skills
+        skills = lister(args.repo, args.path, args.ref, _response_cache(args))
         installed = _installed_skills()
         if args.format == "json":
             payload = [
-                {"name": name, "installed": name in installed} for name in skills
+                {"name": name, "installed": _is_installed(name, installed)} for name in skills
             ]
             print(json.dumps(payload))
         else:
             for idx, name in enumerate(skills, start=1):
-                suffix = " (already installed)" if name in installed else ""
+                suffix = " (already installed)" if _is_installed(name, installed) else ""
                 print(f"{idx}. {name}{suffix}")
         return 0
     except ListError as exc:
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""Search local skills by what they do, using an on-disk SQLite FTS5 index."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+
+DEFAULT_LIMIT = 10
+SKIP_DIRS = {".git", "__pycache__", "node_modules", ".venv", "venv"}
+# bm25 column weights for (name, description, interface).
+BM25_WEIGHTS = (10.0, 3.0, 2.0)
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS skills (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    description TEXT NOT NULL,
+    display_name TEXT NOT NULL,
+    short_description TEXT NOT NULL,
+    signature TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS skills_fts USING fts5(
+    name, description, interface, tokenize = 'porter unicode61'
+);
+"""
+
+
+class SearchError(Exception):
+    pass
+
+
+class Args(argparse.Namespace):
+    query: list[str]
+    root: list[str] | None
+    index: str | None
+    reindex: bool
+    limit: int
+    format: str
+
+
+def _codex_home() -> str:
+    return os.environ.get("CODEX_HOME", os.path.expanduser("~/.codex"))
+
+
+def _default_index() -> str:
+    return os.path.join(_codex_home(), "cache", "skills-index.sqlite")
+
+
+def _default_roots() -> list[str]:
+    return [os.path.join(_codex_home(), "skills")]
+
+
+def _connect(index_path: str) -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(index_path) or ".", exist_ok=True)
+    try:
+        conn = sqlite3.connect(index_path)
+        conn.executescript(SCHEMA)
+    except sqlite3.Error as exc:
+        raise SearchError(f"Cannot open search index {index_path}: {exc}") from exc
+    return conn
+
+
+def _stat_signature(path: str) -> str:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return "-"
+    return f"{st.st_size}:{st.st_mtime_ns}"
+
+
+def _skill_signature(skill_dir: str) -> str:
+    skill_md = _stat_signature(os.path.join(skill_dir, "SKILL.md"))
+    openai_yaml = _stat_signature(os.path.join(skill_dir, "agents", "openai.yaml"))
+    return f"{skill_md}/{openai_yaml}"
+
+
+def _find_skills(root: str) -> list[str]:
+    skills = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+        if "SKILL.md" in filenames:
+            skills.append(os.path.abspath(dirpath))
+    return skills
+
+
+def _read_skill(skill_dir: str, frontmatter) -> dict[str, str]:
+    try:
+        meta = frontmatter.load_frontmatter(os.path.join(skill_dir, "SKILL.md"))
+    except frontmatter.FrontmatterError:
+        # Still index the directory name so broken skills remain findable.
+        meta = {}
+    interface = {}
+    yaml_path = os.path.join(skill_dir, "agents", "openai.yaml")
+    if os.path.isfile(yaml_path):
+        try:
+            with open(yaml_path, "r", encoding="utf-8") as f:
+                document = frontmatter.parse_flat_yaml(f.read())
+            if isinstance(document, dict) and isinstance(document.get("interface"), dict):
+                interface = document["interface"]
+        except Exception:
+            # Malformed UI metadata must not stop the rest of the tree being indexed.
+            interface = {}
+
+    def text(value) -> str:
+        return value if isinstance(value, str) else ""
+
+    return {
+        "name": text(meta.get("name")) or os.path.basename(skill_dir),
+        "description": text(meta.get("description")),
+        "display_name": text(interface.get("display_name")),
+        "short_description": text(interface.get("short_description")),
+        "interface": " ".join(text(value) for value in interface.values()).strip(),
+    }
+
+
+def reindex(conn: sqlite3.Connection, roots: list[str]) -> dict[str, int]:
+    """Bring the index up to date with the skills under roots.
+
+    Only skills whose SKILL.md or agents/openai.yaml size/mtime changed are
+    re-read; skills that disappeared from a root are dropped.
+    """
+    from skill_scripts import creator_script
+
+    try:
+        frontmatter = creator_script("frontmatter.py")
+    except ImportError as exc:
+        raise SearchError(str(exc)) from exc
+    stats = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+    with conn:
+        for root in roots:
+            root = os.path.abspath(root)
+            if not os.path.isdir(root):
+                continue
+            prefix = root.rstrip(os.sep) + os.sep
+            known = {
+                path: signature
+                for path, signature in conn.execute("SELECT path, signature FROM skills")
+                if path == root or path.startswith(prefix)
+            }
+            for skill_dir in _find_skills(root):
+                signature = _skill_signature(skill_dir)
+                previous = known.pop(skill_dir, None)
+                if previous == signature:
+                    stats["unchanged"] += 1
+                    continue
+                skill = _read_skill(skill_dir, frontmatter)
+                if previous is None:
+                    cursor = conn.execute(
+                        "INSERT INTO skills (path, name, description, display_name,"
+                        " short_description, signature) VALUES (?, ?, ?, ?, ?, ?)",
+                        (
+                            skill_dir,
+                            skill["name"],
+                            skill["description"],
+                            skill["display_name"],
+                            skill["short_description"],
+                            signature,
+                        ),
+                    )
+                    row_id = cursor.lastrowid
+                    stats["added"] += 1
+                else:
+                    row_id = conn.execute(
+                        "SELECT id FROM skills WHERE path = ?", (skill_dir,)
+                    ).fetchone()[0]
+                    conn.execute(
+                        "UPDATE skills SET name = ?, description = ?, display_name = ?,"
+                        " short_description = ?, signature = ? WHERE id = ?",
+                        (
+                            skill["name"],
+                            skill["description"],
+                            skill["display_name"],
+                            skill["short_description"],
+                            signature,
+                            row_id,
+                        ),
+                    )
+                    conn.execute("DELETE FROM skills_fts WHERE rowid = ?", (row_id,))
+                    stats["updated"] += 1
+                conn.execute(
+                    "INSERT INTO skills_fts (rowid, name, description, interface)"
+                    " VALUES (?, ?, ?, ?)",
+                    (row_id, skill["name"], skill["description"], skill["interface"]),
+                )
+            for path in known:
+                row_id = conn.execute("SELECT id FROM skills WHERE path = ?", (path,)).fetchone()[0]
+                conn.execute("DELETE FROM skills_fts WHERE rowid = ?", (row_id,))
+                conn.execute("DELETE FROM skills WHERE id = ?", (row_id,))
+                stats["removed"] += 1
+    frontmatter.default_cache().save()
+    return stats
+
+
+def _match_expression(tokens: list[str], operator: str) -> str:
+    # Quote every token so user input can never be read as FTS5 query syntax;
+    # the trailing * makes each token a prefix match.
+    return f" {operator} ".join(f'"{token}"*' for token in tokens)
+
+
+def search(conn: sqlite3.Connection, query: str, limit: int = DEFAULT_LIMIT) -> list[dict]:
+    """Return up to limit skills ranked by bm25 relevance to query.
+
+    All terms must match; if nothing does, any-term matches are returned.
+    """
+    tokens = TOKEN_RE.findall(query.lower())
+    if not tokens:
+        return []
+    sql = (
+        "SELECT s.name, s.path, s.description, s.display_name, s.short_description,"
+        f" bm25(skills_fts, {', '.join(str(w) for w in BM25_WEIGHTS)}) AS score"
+        " FROM skills_fts JOIN skills s ON s.id = skills_fts.rowid"
+        " WHERE skills_fts MATCH ? ORDER BY score LIMIT ?"
+    )
+    operators = ["AND", "OR"] if len(tokens) > 1 else ["AND"]
+    rows = []
+    for operator in operators:
+        rows = conn.execute(sql, (_match_expression(tokens, operator), limit)).fetchall()
+        if rows:
+            break
+    return [
+        {
+            "name": name,
+            "path": path,
+            "description": description,
+            "display_name": display_name,
+            "short_description": short_description,
+            # bm25() is lower-is-better; report a higher-is-better score.
+            "score": round(-score, 4),
+        }
+        for name, path, description, display_name, short_description, score in rows
+    ]
+
+
+def _index_is_empty(conn: sqlite3.Connection) -> bool:
+    return conn.execute("SELECT 1 FROM skills LIMIT 1").fetchone() is None
+
+
+def _positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"invalid integer: {value}") from exc
+    if number < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return number
+
+
+def _parse_args(argv: list[str]) -> Args:
+    parser = argparse.ArgumentParser(description="Search local skills by name and description.")
+    parser.add_argument("query", nargs="*", help="Search terms")
+    parser.add_argument(
+        "--root",
+        action="append",
+        help="Skills directory to index (repeatable; default: $CODEX_HOME/skills)",
+    )
+    parser.add_argument(
+        "--index",
+        help="Index database (default: $CODEX_HOME/cache/skills-index.sqlite)",
+    )
+    parser.add_argument(
+        "--reindex",
+        action="store_true",
+        help="Re-read skills whose SKILL.md or agents/openai.yaml changed before searching",
+    )
+    parser.add_argument(
+        "--limit",
+        type=_positive_int,
+        default=DEFAULT_LIMIT,
+        help=f"Maximum results (default: {DEFAULT_LIMIT})",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["text", "json"],
+        default="text",
+        help="Output format",
+    )
+    return parser.parse_args(argv, namespace=Args())
+
+
+def main(argv: list[str]) -> int:
+    args = _parse_args(argv)
+    query = " ".join(args.query)
+    if not query and not args.reindex:
+        print("Error: provide search terms or --reindex.", file=sys.stderr)
+        return 1
+    try:
+        conn = _connect(args.index or _default_index())
+        with conn:
+            stats = None
+            if args.reindex or _index_is_empty(conn):
+                stats = reindex(conn, args.root or _default_roots())
+            if not query:
+                if args.format == "json":
+                    print(json.dumps(stats))
+                else:
+                    print(", ".join(f"{count} {kind}" for kind, count in stats.items()))
+                return 0
+            start = time.perf_counter()
+            results = search(conn, query, args.limit)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+    except (SearchError, sqlite3.Error) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    if args.format == "json":
+        print(json.dumps({"query": query, "elapsed_ms": round(elapsed_ms, 3), "results": results}))
+    elif not results:
+        print(f"No skills match '{query}'.")
+    else:
+        for idx, result in enumerate(results, start=1):
+            summary = result["short_description"] or result["description"]
+            print(f"{idx}. {result['name']} - {summary}")
+            print(f"   {result['path']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Load the skill scripts (including hyphenated ones) as importable modules."""
+
+from __future__ import annotations
+
+import importlib.util
+import os
+import sys
+import threading
+import types
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+# skill-creator is installed next to skill-installer under skills/.system.
+CREATOR_SCRIPTS_DIR = os.path.normpath(
+    os.path.join(SCRIPTS_DIR, "..", "..", "skill-creator", "scripts")
+)
+
+_lock = threading.Lock()
+
+
+def load_script(directory: str, filename: str) -> types.ModuleType:
+    """Import directory/filename once and return the module.
+
+    The module name is the filename with dashes replaced, so
+    install-skill-from-github.py is importable as install_skill_from_github.
+    """
+    module_name = os.path.splitext(filename)[0].replace("-", "_")
+    with _lock:
+        module = sys.modules.get(module_name)
+        if module is not None:
+            return module
+        if directory not in sys.path:
+            sys.path.insert(0, directory)
+        spec = importlib.util.spec_from_file_location(
+            module_name, os.path.join(directory, filename)
+        )
+        if spec is None or spec.loader is None:
+            raise ImportError(f"Cannot load {filename} from {directory}")
+        module = importlib.util.module_from_spec(spec)
+        # Registered before execution so dataclasses can resolve the module.
+        sys.modules[module_name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[module_name]
+            raise
+        return module
+
+
+def installer_script(filename: str) -> types.ModuleType:
+    return load_script(SCRIPTS_DIR, filename)
+
+
+def creator_script(filename: str) -> types.ModuleType:
+    if not os.path.isdir(CREATOR_SCRIPTS_DIR):
+        raise ImportError(f"skill-creator scripts not found at {CREATOR_SCRIPTS_DIR}")
+    return load_script(CREATOR_SCRIPTS_DIR, filename)
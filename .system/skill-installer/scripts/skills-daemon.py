@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""Long-lived skills service with a JSON-RPC interface on a Unix socket.
+
+`serve` keeps the skill scripts imported, the GitHub connection pool open and
+the frontmatter cache warm, and handles requests from many agents
+concurrently. `call` is the thin client: it forwards one request to the
+daemon, or runs it in-process when no daemon is listening.
+
+Protocol: one JSON-RPC 2.0 request object per line, one response per line.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import socket
+import sys
+import threading
+
+JSONRPC_PARSE_ERROR = -32700
+JSONRPC_INVALID_REQUEST = -32600
+JSONRPC_METHOD_NOT_FOUND = -32601
+JSONRPC_INVALID_PARAMS = -32602
+JSONRPC_INTERNAL_ERROR = -32603
+JSONRPC_APPLICATION_ERROR = -32000
+MAX_LINE_BYTES = 16 * 1024 * 1024
+
+
+class DaemonError(Exception):
+    def __init__(self, code: int, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+
+
+class _ThreadStdout:
+    """sys.stdout stand-in that sends a capturing thread's output to its own buffer.
+
+    contextlib.redirect_stdout swaps sys.stdout for the whole process, which
+    would also capture (or hide) output of requests served by other threads.
+    """
+
+    def __init__(self, default) -> None:
+        self._default = default
+        self._local = threading.local()
+
+    def _target(self):
+        return getattr(self._local, "buffer", None) or self._default
+
+    def write(self, text: str) -> int:
+        return self._target().write(text)
+
+    def flush(self) -> None:
+        self._target().flush()
+
+    def __getattr__(self, name: str):
+        return getattr(self._default, name)
+
+    @contextlib.contextmanager
+    def capture(self):
+        self._local.buffer = io.StringIO()
+        try:
+            yield self._local.buffer
+        finally:
+            self._local.buffer = None
+
+
+_stdout_lock = threading.Lock()
+
+
+def _capture_stdout():
+    """Context manager capturing this thread's stdout writes into a StringIO."""
+    with _stdout_lock:
+        if not isinstance(sys.stdout, _ThreadStdout):
+            sys.stdout = _ThreadStdout(sys.stdout)
+        return sys.stdout.capture()
+
+
+def _codex_home() -> str:
+    return os.environ.get("CODEX_HOME", os.path.expanduser("~/.codex"))
+
+
+def _default_socket() -> str:
+    return os.path.join(_codex_home(), "skills-daemon.sock")
+
+
+class SkillsService:
+    """The methods served over JSON-RPC, built on the existing script functions."""
+
+    def __init__(self) -> None:
+        from skill_scripts import creator_script, installer_script
+
+        self._installer = installer_script("install-skill-from-github.py")
+        self._lister = installer_script("list-skills.py")
+        self._searcher = installer_script("search-skills.py")
+        self._validator = creator_script("quick_validate.py")
+        self._initializer = creator_script("init_skill.py")
+        self._frontmatter = creator_script("frontmatter.py")
+
+    def ping(self) -> str:
+        return "pong"
+
+    def list_skills(
+        self,
+        repo: str | None = None,
+        path: str | None = None,
+        ref: str | None = None,
+        recursive: bool = False,
+        no_cache: bool = False,
+        cache_ttl: float | None = None,
+    ) -> list[dict]:
+        lister = self._lister
+        args = lister.Args(no_cache=no_cache, cache_ttl=cache_ttl or lister.DEFAULT_CACHE_TTL)
+        list_fn = lister._discover_skills if recursive else lister._list_skills
+        skills = list_fn(
+            repo or lister.DEFAULT_REPO,
+            lister.DEFAULT_PATH if path is None else path,
+            ref or lister.DEFAULT_REF,
+            lister._response_cache(args),
+        )
+        installed = lister._installed_skills()
+        return [
+            {"name": name, "installed": lister._is_installed(name, installed)} for name in skills
+        ]
+
+    def search_skills(
+        self,
+        query: str,
+        limit: int = 10,
+        reindex: bool = False,
+        roots: list[str] | None = None,
+    ) -> list[dict]:
+        searcher = self._searcher
+        # sqlite3 connections are bound to their thread, so each request opens its own.
+        conn = searcher._connect(searcher._default_index())
+        try:
+            if reindex or searcher._index_is_empty(conn):
+                searcher.reindex(conn, roots or searcher._default_roots())
+            return searcher.search(conn, query, limit)
+        finally:
+            conn.close()
+
+    def validate_skill(self, path: str) -> dict:
+        valid, message = self._validator.validate_skill(path)
+        self._frontmatter.default_cache().save()
+        return {"valid": valid, "message": message}
+
+    def init_skill(
+        self,
+        name: str,
+        path: str,
+        resources: list[str] | None = None,
+        examples: bool = False,
+        interface: list[str] | None = None,
+    ) -> dict:
+        initializer = self._initializer
+        skill_name = initializer.normalize_skill_name(name)
+        if not skill_name or len(skill_name) > initializer.MAX_SKILL_NAME_LENGTH:
+            raise DaemonError(JSONRPC_INVALID_PARAMS, f"Invalid skill name: {name}")
+        invalid = sorted(set(resources or []) - initializer.ALLOWED_RESOURCES)
+        if invalid:
+            raise DaemonError(JSONRPC_INVALID_PARAMS, f"Unknown resource type(s): {invalid}")
+        # init_skill reports progress on stdout, which carries the JSON-RPC reply;
+        # capture it per request and return it instead.
+        with _capture_stdout() as output:
+            result = initializer.init_skill(
+                skill_name, path, list(resources or []), examples, list(interface or [])
+            )
+        if result is None:
+            message = output.getvalue().strip() or f"Failed to initialize {skill_name}"
+            raise DaemonError(JSONRPC_APPLICATION_ERROR, message)
+        return {"name": skill_name, "path": str(result), "output": output.getvalue()}
+
+    def install(self, **params) -> list[dict]:
+        installer = self._installer
+        # Updates stay on the CLI (--update); the daemon only performs installs.
+        unknown = set(params) - (set(installer.Args.__dataclass_fields__) - {"update"})
+        if unknown:
+            raise DaemonError(JSONRPC_INVALID_PARAMS, f"Unknown install params: {sorted(unknown)}")
+        if isinstance(params.get("path"), str):
+            params["path"] = [params["path"]]
+        results = installer.install(installer.Args(**params))
+        return [
+            {
+                "name": result.name,
+                "dest_dir": result.dest_dir,
+                "seconds": round(result.seconds, 3),
+                "error": result.error,
+            }
+            for result in results
+        ]
+
+    def dispatch(self, method: str, params: dict | list | None):
+        import inspect
+
+        handler = None if method.startswith("_") or method == "dispatch" else getattr(self, method, None)
+        if handler is None or not callable(handler):
+            raise DaemonError(JSONRPC_METHOD_NOT_FOUND, f"Method not found: {method}")
+        args = params if isinstance(params, list) else []
+        kwargs = params if isinstance(params, dict) else {}
+        try:
+            inspect.signature(handler).bind(*args, **kwargs)
+        except TypeError as exc:
+            raise DaemonError(JSONRPC_INVALID_PARAMS, str(exc)) from exc
+        try:
+            return handler(*args, **kwargs)
+        except DaemonError:
+            raise
+        except (
+            self._installer.InstallError,
+            self._lister.ListError,
+            self._searcher.SearchError,
+            OSError,
+            ValueError,
+        ) as exc:
+            raise DaemonError(JSONRPC_APPLICATION_ERROR, str(exc)) from exc
+        except Exception as exc:
+            # Any other failure still gets a reply instead of killing the connection.
+            raise DaemonError(
+                JSONRPC_INTERNAL_ERROR, f"Internal error: {type(exc).__name__}: {exc}"
+            ) from exc
+
+
+def _handle_request(service: SkillsService, line: bytes) -> dict | None:
+    """Returns the response object, or None for a notification (a request without an id)."""
+    request_id = None
+    notification = False
+    try:
+        try:
+            request = json.loads(line)
+        except ValueError as exc:
+            raise DaemonError(JSONRPC_PARSE_ERROR, f"Parse error: {exc}") from exc
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            raise DaemonError(JSONRPC_INVALID_REQUEST, "Invalid request")
+        request_id = request.get("id")
+        notification = "id" not in request
+        result = service.dispatch(request["method"], request.get("params"))
+    except DaemonError as exc:
+        if notification:
+            return None
+        return {
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "error": {"code": exc.code, "message": str(exc)},
+        }
+    if notification:
+        return None
+    return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+
+def serve(socket_path: str) -> int:
+    import signal
+    import socketserver
+
+    service = SkillsService()
+    if os.path.exists(socket_path):
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(socket_path)
+        except OSError:
+            os.unlink(socket_path)
+        else:
+            probe.close()
+            print(f"Error: a daemon is already listening on {socket_path}", file=sys.stderr)
+            return 1
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            while True:
+                line = self.rfile.readline(MAX_LINE_BYTES)
+                if not line:
+                    return
+                if not line.strip():
+                    continue
+                response = _handle_request(service, line)
+                if response is not None:
+                    self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+                    self.wfile.flush()
+
+    class Server(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+    os.makedirs(os.path.dirname(socket_path) or ".", exist_ok=True)
+    old_umask = os.umask(0o177)
+    try:
+        server = Server(socket_path, Handler)
+    finally:
+        os.umask(old_umask)
+    print(f"skills-daemon listening on {socket_path}", file=sys.stderr)
+
+    def _terminate(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, _terminate)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+    return 0
+
+
+def call(socket_path: str, method: str, params: dict | list | None, fallback: bool = True) -> dict:
+    request = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params or {}}
+    try:
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        conn.connect(socket_path)
+    except OSError:
+        if not fallback:
+            raise
+        # No daemon running: serve the request in this process instead.
+        return _handle_request(SkillsService(), json.dumps(request).encode("utf-8"))
+    with conn, conn.makefile("rwb") as stream:
+        stream.write(json.dumps(request).encode("utf-8") + b"\n")
+        stream.flush()
+        line = stream.readline(MAX_LINE_BYTES)
+    if not line:
+        raise OSError("Daemon closed the connection without responding.")
+    return json.loads(line)
+
+
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Skills daemon and client.")
+    parser.add_argument("--socket", default=None, help="Unix socket path")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("serve", help="Run the daemon in the foreground")
+    call_parser = sub.add_parser("call", help="Send one request to the daemon")
+    call_parser.add_argument(
+        "method",
+        help="ping, list_skills, search_skills, validate_skill, init_skill or install",
+    )
+    call_parser.add_argument("params", nargs="?", default="{}", help="JSON params object")
+    call_parser.add_argument(
+        "--no-fallback",
+        action="store_true",
+        help="Fail instead of running in-process when no daemon is listening",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str]) -> int:
+    args = _parse_args(argv)
+    socket_path = args.socket or _default_socket()
+    if args.command == "serve":
+        return serve(socket_path)
+    try:
+        params = json.loads(args.params)
+    except ValueError as exc:
+        print(f"Error: params must be JSON: {exc}", file=sys.stderr)
+        return 1
+    try:
+        response = call(socket_path, args.method, params, fallback=not args.no_fallback)
+    except OSError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    if "error" in response:
+        print(f"Error: {response['error']['message']}", file=sys.stderr)
+        return 1
+    print(json.dumps(response["result"]))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
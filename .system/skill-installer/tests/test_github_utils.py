@@ -0,0 +1,119 @@
+"""Tests for github_utils.HttpClient and the response cache, against a local stand-in server."""
+
+from __future__ import annotations
+
+import gzip
+import os
+import sys
+import tempfile
+import threading
+import unittest
+import urllib.error
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts")
+sys.path.insert(0, os.path.normpath(SCRIPTS_DIR))
+
+import github_utils  # noqa: E402
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, self.client_address, dict(self.headers)))
+            scripted = server.script.get(self.path)
+            status = scripted.pop(0) if scripted else 200
+        body = b"hello " * 100
+        headers = {}
+        if status in (429, 503):
+            body = b"try again"
+            headers["Retry-After"] = "0"
+        elif self.path == "/gzip" and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            headers["Content-Encoding"] = "gzip"
+        elif self.path == "/etag":
+            headers["ETag"] = '"v1"'
+            body = b'{"version": 1}'
+            if self.headers.get("If-None-Match") == '"v1"':
+                status, body = 304, b""
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(body)
+
+
+class HttpClientTest(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.requests = []
+        self.server.script = {}
+        threading.Thread(target=self.server.serve_forever, args=(0.01,), daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.base = f"http://127.0.0.1:{self.server.server_port}"
+        patch = mock.patch.object(github_utils, "_proxy_for", return_value=None)
+        patch.start()
+        self.addCleanup(patch.stop)
+        self.client = github_utils.HttpClient(timeout=5, max_retries=2, backoff=0)
+        self.addCleanup(self.client.close)
+
+    def test_reuses_keep_alive_connections(self):
+        for _ in range(3):
+            self.assertEqual(self.client.request(f"{self.base}/plain").body, b"hello " * 100)
+        self.assertEqual(len({address for _, address, _ in self.server.requests}), 1)
+
+    def test_decodes_gzip(self):
+        response = self.client.request(f"{self.base}/gzip")
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertEqual(response.body, b"hello " * 100)
+        with tempfile.TemporaryDirectory() as tmp:
+            dest = os.path.join(tmp, "body")
+            written = self.client.download(f"{self.base}/gzip", dest, {"Accept-Encoding": "gzip"})
+            with open(dest, "rb") as file_handle:
+                self.assertEqual(file_handle.read(), b"hello " * 100)
+        self.assertEqual(written, len(b"hello " * 100))
+
+    def test_retries_429_and_5xx(self):
+        self.server.script["/plain"] = [429, 503]
+        self.assertEqual(self.client.request(f"{self.base}/plain").status, 200)
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_gives_up_after_max_retries(self):
+        self.server.script["/plain"] = [503, 503, 503, 503]
+        with self.assertRaises(urllib.error.HTTPError) as caught:
+            self.client.request(f"{self.base}/plain")
+        self.assertEqual(caught.exception.code, 503)
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_cached_request_revalidates_with_304(self):
+        previous = github_utils.default_client()
+        github_utils.set_default_client(self.client)
+        self.addCleanup(github_utils.set_default_client, previous)
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = github_utils.ResponseCache(tmp, ttl=0)
+            url = f"{self.base}/etag"
+            self.assertEqual(github_utils.github_request_cached(url, "test", cache), b'{"version": 1}')
+            self.assertEqual(github_utils.github_request_cached(url, "test", cache), b'{"version": 1}')
+            self.assertNotIn("If-None-Match", self.server.requests[0][2])
+            self.assertEqual(self.server.requests[1][2].get("If-None-Match"), '"v1"')
+
+            cache.ttl = 60
+            self.assertEqual(github_utils.github_request_cached(url, "test", cache), b'{"version": 1}')
+            self.assertEqual(len(self.server.requests), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
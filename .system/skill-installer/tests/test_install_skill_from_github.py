@@ -0,0 +1,259 @@
+"""Tests for install-skill-from-github.py."""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+import zipfile
+from unittest import mock
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts")
+sys.path.insert(0, os.path.normpath(SCRIPTS_DIR))
+
+from skill_scripts import installer_script  # noqa: E402
+
+installer = installer_script("install-skill-from-github.py")
+
+
+def _archive(names: list[str]) -> zipfile.ZipFile:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zip_file:
+        for name in names:
+            zip_file.writestr(name, "x")
+    buffer.seek(0)
+    return zipfile.ZipFile(buffer)
+
+
+class ArchiveMemberSelectedTest(unittest.TestCase):
+    def test_plain_and_dot_slash_paths_match_the_same_members(self):
+        for path in ("skills/a", "./skills/a", "skills/a/", "skills//a", "./skills/./a"):
+            with self.subTest(path=path):
+                self.assertTrue(installer._archive_member_selected("repo-main/skills/a/SKILL.md", [path]))
+                self.assertTrue(installer._archive_member_selected("repo-main/skills/a", [path]))
+                self.assertFalse(installer._archive_member_selected("repo-main/skills/ab/SKILL.md", [path]))
+
+    def test_repo_root_selects_everything(self):
+        for path in (".", "./", ""):
+            with self.subTest(path=path):
+                self.assertTrue(installer._archive_member_selected("repo-main/any/file", [path]))
+
+    def test_extract_dot_slash_path(self):
+        archive = _archive([
+            "repo-main/skills/a/SKILL.md",
+            "repo-main/skills/a/scripts/run.py",
+            "repo-main/skills/b/SKILL.md",
+        ])
+        with tempfile.TemporaryDirectory() as dest:
+            installer._safe_extract_zip(archive, dest, ["./skills/a"])
+            self.assertTrue(os.path.isfile(os.path.join(dest, "repo-main/skills/a/SKILL.md")))
+            self.assertTrue(os.path.isfile(os.path.join(dest, "repo-main/skills/a/scripts/run.py")))
+            self.assertFalse(os.path.exists(os.path.join(dest, "repo-main/skills/b")))
+
+
+class UpdateTest(unittest.TestCase):
+    OLD_SHA, NEW_SHA = "1" * 40, "2" * 40
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.dest = os.path.join(self.tmp.name, "skills")
+        patches = [
+            mock.patch.dict(os.environ, {"CODEX_HOME": os.path.join(self.tmp.name, "home")}),
+            mock.patch.object(installer, "_resolve_commit_sha", return_value=self.NEW_SHA),
+            mock.patch.object(installer, "_fetch_tree_shas", return_value={}),
+            mock.patch.object(installer, "_download", side_effect=self._write_archive),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        for name in ("a", "b", "c"):
+            self._install(name)
+
+    def _write_archive(self, url: str, dest_path: str) -> None:
+        with zipfile.ZipFile(dest_path, "w") as zip_file:
+            zip_file.comment = self.NEW_SHA.encode("ascii")
+            for name in ("a", "b", "c"):
+                zip_file.writestr(f"r-main/skills/{name}/SKILL.md", f"{name} v2")
+
+    def _install(self, name: str) -> None:
+        skill_dir = os.path.join(self.dest, name)
+        os.makedirs(skill_dir)
+        with open(os.path.join(skill_dir, "SKILL.md"), "w", encoding="utf-8") as file_handle:
+            file_handle.write(f"{name} v1")
+        source = installer.Source(owner="o", repo="r", ref="main", paths=[], commit=self.OLD_SHA)
+        manifest = installer._build_manifest(
+            source, f"skills/{name}", None, installer._hash_tree(skill_dir)
+        )
+        with open(os.path.join(skill_dir, installer.MANIFEST_NAME), "w", encoding="utf-8") as file_handle:
+            json.dump(manifest, file_handle)
+
+    def _read(self, name: str) -> str:
+        with open(os.path.join(self.dest, name, "SKILL.md"), encoding="utf-8") as file_handle:
+            return file_handle.read()
+
+    def test_local_edits_fail_only_that_skill(self):
+        with open(os.path.join(self.dest, "b", "SKILL.md"), "w", encoding="utf-8") as file_handle:
+            file_handle.write("b edited")
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            rc = installer.main(["--update", "--dest", self.dest, "--method", "download"])
+        self.assertEqual(rc, 1)
+        self.assertEqual(
+            stdout.getvalue().splitlines(),
+            ["Updated a (1 changed, 0 removed)", "Updated c (1 changed, 0 removed)"],
+        )
+        self.assertIn("Failed to update b: Local changes would be overwritten: SKILL.md", stderr.getvalue())
+        self.assertEqual([self._read(name) for name in ("a", "b", "c")], ["a v2", "b edited", "c v2"])
+
+
+class ArchiveCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patch = mock.patch.dict(os.environ, {"CODEX_HOME": self.tmp.name})
+        patch.start()
+        self.addCleanup(patch.stop)
+        os.makedirs(installer._archive_cache_dir())
+
+    def _cache(self, sha: str, age: float) -> str:
+        path = installer._cache_archive_path(sha)
+        with open(path, "wb") as file_handle:
+            file_handle.write(b"x" * 1000)
+        mtime = time.time() - age
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def test_skips_acquired_archives(self):
+        oldest = self._cache("1" * 40, 300)
+        in_use = self._cache("2" * 40, 200)
+        newest = self._cache("3" * 40, 100)
+        installer._acquire_archive(in_use)
+        try:
+            installer._evict_archive_cache(1000)
+            self.assertEqual(
+                [os.path.exists(path) for path in (oldest, in_use, newest)], [False, True, False]
+            )
+        finally:
+            installer._release_archive(in_use)
+        installer._evict_archive_cache(0)
+        self.assertFalse(os.path.exists(in_use))
+
+    def test_cache_hit_bumps_recency(self):
+        older = self._cache("1" * 40, 200)
+        newer = self._cache("2" * 40, 100)
+        installer._release_archive(installer._cache_get_archive("1" * 40))
+        installer._evict_archive_cache(1000)
+        self.assertEqual([os.path.exists(path) for path in (older, newer)], [True, False])
+
+    def test_concurrent_ref_stores_keep_every_ref(self):
+        write_json_atomic = installer._write_json_atomic
+
+        def slow_write(path: str, data: object) -> None:
+            time.sleep(0.01)
+            write_json_atomic(path, data)
+
+        with mock.patch.object(installer, "_write_json_atomic", side_effect=slow_write):
+            threads = [
+                threading.Thread(target=installer._cache_store_ref, args=("o", f"r{i}", "main", str(i) * 40))
+                for i in range(1, 9)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        for i in range(1, 9):
+            self.assertEqual(installer._cache_lookup_ref("o", f"r{i}", "main"), str(i) * 40)
+
+    def test_download_releases_its_archive(self):
+        sha = "4" * 40
+
+        def download(url: str, dest_path: str) -> None:
+            with zipfile.ZipFile(dest_path, "w") as zip_file:
+                zip_file.writestr("r-main/skills/a/SKILL.md", "a")
+
+        with mock.patch.object(installer, "_resolve_commit_sha", return_value=sha), \
+                mock.patch.object(installer, "_download", side_effect=download):
+            for _ in range(2):
+                root, _ = installer._download_repo_zip("o", "r", "main", tempfile.mkdtemp(dir=self.tmp.name))
+                self.assertTrue(os.path.isfile(os.path.join(root, "skills/a/SKILL.md")))
+        self.assertNotIn(installer._cache_archive_path(sha), installer._archives_in_use)
+        installer._evict_archive_cache(0)
+        self.assertFalse(os.path.exists(installer._cache_archive_path(sha)))
+
+
+class LoadLockfileTest(unittest.TestCase):
+    def _load(self, entries: list) -> list[dict]:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "skills.lock.json")
+            with open(path, "w", encoding="utf-8") as file_handle:
+                json.dump(entries, file_handle)
+            return installer._load_lockfile(path)
+
+    def test_rejects_non_string_fields(self):
+        base = {"repo": "o/r", "path": "skills/a"}
+        for field in ("repo", "path", "name", "ref", "commit"):
+            with self.subTest(field=field):
+                with self.assertRaisesRegex(installer.InstallError, "entry 1 .*string"):
+                    self._load([base, {**base, field: 5}])
+
+    def test_accepts_optional_fields(self):
+        entries = [
+            {"repo": "o/r", "path": "skills/a"},
+            {"repo": "o/r", "path": "skills/b", "name": "b", "ref": "v1", "commit": "1" * 40},
+            {"repo": "o/r", "path": "skills/c", "name": None, "ref": None},
+        ]
+        self.assertEqual(self._load(entries), entries)
+
+
+class InstallTest(unittest.TestCase):
+    SHA = "5" * 40
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.dest = os.path.join(self.tmp.name, "skills")
+        os.makedirs(os.path.join(self.dest, "a"))
+        self.downloads = []
+        patches = [
+            mock.patch.dict(os.environ, {"CODEX_HOME": os.path.join(self.tmp.name, "home")}),
+            mock.patch.object(installer, "_resolve_commit_sha", return_value=self.SHA),
+            mock.patch.object(installer, "_fetch_tree_shas", return_value={}),
+            mock.patch.object(installer, "_download", side_effect=self._write_archive),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def _write_archive(self, url: str, dest_path: str) -> None:
+        self.downloads.append(url)
+        with zipfile.ZipFile(dest_path, "w") as zip_file:
+            for name in ("a", "b"):
+                zip_file.writestr(f"r-main/skills/{name}/SKILL.md", name)
+
+    def _install(self, *paths: str) -> list:
+        args = installer._parse_args(["--repo", "o/r", "--dest", self.dest, "--path", *paths])
+        return installer.install(args)
+
+    def test_existing_destination_is_refused_before_download(self):
+        results = self._install("skills/a")
+        self.assertEqual(self.downloads, [])
+        self.assertEqual([(result.name, result.ok) for result in results], [("a", False)])
+        self.assertIn("Destination already exists", results[0].error)
+
+    def test_other_skills_still_install(self):
+        results = self._install("skills/a", "skills/b")
+        self.assertEqual(len(self.downloads), 1)
+        self.assertEqual([(result.name, result.ok) for result in results], [("a", False), ("b", True)])
+        self.assertTrue(os.path.isfile(os.path.join(self.dest, "b", "SKILL.md")))
+        self.assertEqual(os.listdir(os.path.join(self.dest, "a")), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+"""
+Warm pool of pre-launched CLI app processes.
+
+Instead of starting and stopping the app around every scenario, TestAgent can
+borrow an already running (and ready) process from the pool. Before each
+borrow the app is sent a "reset" command to return it to its initial state;
+a process is only replaced when it crashed, failed its reset, or has served
+max_uses scenarios.
+"""
+import logging
+import queue
+import threading
+
+from transports import AsyncCLITransport, TransportError
+
+logger = logging.getLogger("TestAgent.AppPool")
+
+
+class AppProcessPool:
+    def __init__(self,
+                 app_executable_path: str,
+                 size: int = 1,
+                 max_uses: int = 100,
+                 action_timeout_sec: float = 5.0,
+                 ready_timeout_sec: float = 10.0):
+        """
+        :param app_executable_path: Path to the Apple App executable (e.g. built CLI tool)
+        :param size: Number of app processes kept running.
+        :param max_uses: Scenarios a process may serve before it is replaced.
+        :param action_timeout_sec: Per-command timeout for the pooled transports.
+        :param ready_timeout_sec: How long a new process may take to answer its first ping.
+        """
+        if size < 1:
+            raise ValueError("AppProcessPool size must be at least 1.")
+        self.app_executable_path = app_executable_path
+        self.size = size
+        self.max_uses = max_uses
+        self.action_timeout_sec = action_timeout_sec
+        self.ready_timeout_sec = ready_timeout_sec
+        self._idle = queue.Queue()
+        self._uses = {}
+        self._lock = threading.Lock()
+        self._all = set()
+        self._closed = False
+        self.launched = 0
+        self.recycled = 0
+
+    def start(self):
+        """Launches every process up front and waits for all of them to be ready."""
+        transports = [self._spawn() for _ in range(self.size)]
+        futures = [t.submit({"action": "ping"}, self.ready_timeout_sec) for t in transports]
+        for transport, future in zip(transports, futures):
+            try:
+                future.result()
+            except TransportError:
+                self._discard(transport)
+                transport = self._launch()
+            self._idle.put(transport)
+        logger.info(f"App pool ready with {self.size} process(es)")
+
+    def acquire(self, timeout: float = None) -> AsyncCLITransport:
+        """
+        Borrows a ready app process, reset to its initial state.
+        Blocks until one is free (or raises queue.Empty after timeout).
+        """
+        if self._closed:
+            raise RuntimeError("AppProcessPool is closed.")
+        transport = self._idle.get(timeout=timeout)
+        try:
+            return self._prepare(transport)
+        except BaseException:
+            # Keep the slot so a failed relaunch does not shrink the pool.
+            self._idle.put(None)
+            raise
+
+    def release(self, transport: AsyncCLITransport):
+        """
+        Returns a borrowed process. Processes that crashed, are worn out, or had a
+        command time out (a late reply could still be on its way) are replaced lazily.
+        """
+        with self._lock:
+            self._uses[transport] = self._uses.get(transport, 0) + 1
+            worn_out = self._uses[transport] >= self.max_uses
+        if self._closed or worn_out or transport.timeouts or not transport.is_alive():
+            self._discard(transport)
+            # The replacement is launched by the next acquire().
+            self._idle.put(None)
+        else:
+            self._idle.put(transport)
+
+    def close(self):
+        """Stops every process owned by the pool."""
+        self._closed = True
+        with self._lock:
+            transports = list(self._all)
+        for transport in transports:
+            self._discard(transport)
+
+    def stats(self) -> dict:
+        return {"size": self.size, "launched": self.launched, "recycled": self.recycled}
+
+    def _prepare(self, transport: AsyncCLITransport) -> AsyncCLITransport:
+        if transport is None or not transport.is_alive():
+            if transport is not None:
+                self._discard(transport)
+            return self._launch()
+        try:
+            response = transport.request({"action": "reset"})
+        except TransportError as e:
+            logger.warning(f"Reset failed ({e}); replacing app process")
+            self._discard(transport)
+            return self._launch()
+        if isinstance(response, dict) and "error" in response:
+            logger.warning(f"App rejected reset ({response['error']}); replacing app process")
+            self._discard(transport)
+            return self._launch()
+        return transport
+
+    def _spawn(self) -> AsyncCLITransport:
+        transport = AsyncCLITransport(
+            self.app_executable_path, action_timeout_sec=self.action_timeout_sec
+        )
+        transport.start()
+        with self._lock:
+            self._all.add(transport)
+            self.launched += 1
+        return transport
+
+    def _launch(self) -> AsyncCLITransport:
+        transport = self._spawn()
+        try:
+            transport.wait_ready(self.ready_timeout_sec)
+        except TransportError:
+            self._discard(transport)
+            raise
+        return transport
+
+    def _discard(self, transport: AsyncCLITransport):
+        with self._lock:
+            if transport not in self._all:
+                return
+            self._all.discard(transport)
+            self._uses.pop(transport, None)
+            if not self._closed:
+                self.recycled += 1
+        try:
+            transport.close()
+        except Exception as e:
+            logger.warning(f"Failed to stop app process cleanly: {e}")
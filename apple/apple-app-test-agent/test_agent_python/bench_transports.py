@@ -0,0 +1,161 @@
+"""
+Round-trip latency benchmark for the TestAgent transports.
+
+Starts bridge_server.py (the stand-in app) with TCP, Unix socket and HTTP
+listeners, then times the same user action over each transport:
+- http new connection: one urllib request (and TCP connection) per action
+- http keep-alive: TestAgent's HTTP mode (pooled HTTP/1.1 connections)
+- http batch: --window actions per POST to the batch endpoint
+- socket tcp / unix: one persistent framed connection, one command at a time
+- socket tcp pipelined: commands submitted in windows of --window and
+  collected together
+
+Usage:
+    python bench_transports.py [--actions N] [--window N] [--state-size N]
+"""
+import argparse
+import logging
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def summarize(name: str, latencies: list, elapsed: float) -> str:
+    latencies = sorted(latencies)
+    p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)]
+    return (
+        f"{name:<24} median {statistics.median(latencies) * 1e6:8.1f} us   "
+        f"p95 {p95 * 1e6:8.1f} us   {len(latencies) / elapsed:9.0f} actions/s"
+    )
+
+
+def time_sequential(send, actions: int):
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(actions):
+        t0 = time.perf_counter()
+        send()
+        latencies.append(time.perf_counter() - t0)
+    return latencies, time.perf_counter() - started
+
+
+def time_batched(transport, actions: int, window: int):
+    latencies = []
+    started = time.perf_counter()
+    for offset in range(0, actions, window):
+        count = min(window, actions - offset)
+        t0 = time.perf_counter()
+        transport.request_batch([{"action": "click_useless_button"}] * count)
+        latencies.extend([(time.perf_counter() - t0) / count] * count)
+    return latencies, time.perf_counter() - started
+
+
+def time_pipelined(transport, actions: int, window: int):
+    # Per-action latency is the window's round trip divided by its size.
+    latencies = []
+    started = time.perf_counter()
+    for offset in range(0, actions, window):
+        count = min(window, actions - offset)
+        t0 = time.perf_counter()
+        futures = [transport.submit({"action": "click_useless_button"}) for _ in range(count)]
+        for future in futures:
+            future.result()
+        latencies.extend([(time.perf_counter() - t0) / count] * count)
+    return latencies, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark TestAgent transports.")
+    parser.add_argument("--actions", type=int, default=2000, help="Actions per transport")
+    parser.add_argument("--window", type=int, default=50, help="Pipelining window size")
+    parser.add_argument("--state-size", type=int, default=0, help="Extra cells in the app state")
+    args = parser.parse_args()
+
+    sys.path.insert(0, HERE)
+    from main import TestAgent
+    from transports import HTTPTransport, SocketTransport, TransportError
+
+    logging.getLogger("TestAgent").setLevel(logging.WARNING)
+    tcp_address = f"tcp://127.0.0.1:{free_port()}"
+    http_port = free_port()
+    unix_path = os.path.join(tempfile.mkdtemp(prefix="bridge-"), "app.sock")
+    server = subprocess.Popen(
+        [sys.executable, os.path.join(HERE, "bridge_server.py"),
+         "--tcp", tcp_address, "--unix", unix_path,
+         "--http", f"127.0.0.1:{http_port}", "--state-size", str(args.state_size)],
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        results = []
+
+        base_url = f"http://127.0.0.1:{http_port}/"
+        deadline = time.monotonic() + 10
+        while True:
+            try:
+                HTTPTransport(base_url).wait_ready()
+                break
+            except TransportError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.05)
+
+        def urllib_action():
+            request = urllib.request.Request(
+                base_url, data=b'{"action": "click_useless_button"}', method="POST",
+                headers={"Content-Type": "application/json"},
+            )
+            with urllib.request.urlopen(request, timeout=5) as response:
+                response.read()
+
+        results.append(summarize("http new connection", *time_sequential(urllib_action, args.actions)))
+
+        http_agent = TestAgent(connection_mode="http", base_url=base_url, http_batch_url=base_url)
+        http_agent.start_app()
+        results.append(summarize(
+            "http keep-alive",
+            *time_sequential(lambda: http_agent.send_user_action("click_useless_button"), args.actions),
+        ))
+        results.append(summarize(
+            f"http batch x{args.window}",
+            *time_batched(http_agent.transport, args.actions, args.window),
+        ))
+        http_agent.stop_app()
+
+        for name, address in (("socket tcp", tcp_address), ("socket unix", f"unix://{unix_path}")):
+            transport = SocketTransport(address)
+            transport.start()
+            transport.wait_ready()
+            results.append(summarize(
+                name,
+                *time_sequential(lambda: transport.request({"action": "click_useless_button"}), args.actions),
+            ))
+            if name == "socket tcp":
+                results.append(summarize(
+                    f"socket tcp pipelined x{args.window}",
+                    *time_pipelined(transport, args.actions, args.window),
+                ))
+            transport.close()
+
+        print(f"{args.actions} actions per transport (state size {args.state_size})")
+        for line in results:
+            print(line)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
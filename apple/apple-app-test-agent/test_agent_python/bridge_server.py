@@ -0,0 +1,250 @@
+"""
+Stand-in app / Simulator Bridge for exercising and benchmarking TestAgent
+without a real Apple app.
+
+It implements the command contract from SKILL.md (ping, get_state,
+get_state_since, set_condition, reset, user actions) over every transport TestAgent speaks:
+- CLI: one JSON command per line on stdin, one response per line on stdout
+- socket: length-prefixed JSON/msgpack frames over TCP or a Unix socket
+- HTTP: POST a JSON command, or a JSON array of commands as a batch, to any
+  path (HTTP/1.1 keep-alive)
+
+Usage:
+    python bridge_server.py --cli
+    python bridge_server.py --tcp 127.0.0.1:8765 --http 127.0.0.1:8080
+    python bridge_server.py --unix /tmp/app.sock --state-size 10000
+"""
+import argparse
+import asyncio
+import collections
+import copy
+import json
+import logging
+import random
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from snapshots import json_diff
+from transports import FRAME_HEADER, MAX_FRAME_BYTES, decode_payload, encode_payload, parse_address
+
+logger = logging.getLogger("TestAgent.BridgeServer")
+
+
+class StandInApp:
+    """A tiny deterministic card-game state machine behind the app command contract."""
+
+    def __init__(self, state_size: int = 0):
+        """
+        :param state_size: Number of extra board cells, to emulate apps with large state trees.
+        """
+        self.state_size = state_size
+        self._lock = threading.Lock()
+        # Versions handed out by get_state_since, with a copy of the state at
+        # each; the counter keeps growing across resets so versions never repeat.
+        self.state_version = 0
+        self.reset()
+
+    def reset(self):
+        self._versions = collections.OrderedDict()
+        self._changed = True
+        self.rng = random.Random(0)
+        self.state = {
+            "version": "1.0",
+            "status": "ok",
+            "tick": 0,
+            "game_phase": "playing",
+            "game_status": "running",
+            "rng_seed": 0,
+            "player_states": {"player1": {"score": 0, "hand": 5}, "player2": {"score": 0, "hand": 5}},
+            "board_state": {
+                "played_cards": [],
+                "cells": {f"cell_{i}": 0 for i in range(self.state_size)},
+            },
+        }
+
+    def handle(self, command) -> dict:
+        if not isinstance(command, dict):
+            return {"error": "Command must be a JSON object"}
+        with self._lock:
+            response = self._dispatch(command.get("action"), command.get("data") or {})
+        if "id" in command:
+            response["id"] = command["id"]
+        return response
+
+    def _dispatch(self, action, data) -> dict:
+        state = self.state
+        if action == "ping":
+            return {"status": "ready"}
+        if action == "get_state":
+            return copy.deepcopy(state)
+        if action == "get_state_since":
+            return self._state_since(data.get("since"))
+        if action == "reset":
+            self.reset()
+            return {"status": "reset"}
+        if action == "set_condition":
+            if "rng_seed" in data:
+                self.rng.seed(data["rng_seed"])
+            for key, value in data.items():
+                if key.endswith("_score") and key[:-len("_score")] in state["player_states"]:
+                    state["player_states"][key[:-len("_score")]]["score"] = value
+                else:
+                    state[key] = value
+            self._changed = True
+            return {"status": "ok"}
+        if action == "invalid_action_triggering_crash":
+            return {"error": "Unknown action: invalid_action_triggering_crash"}
+        state["tick"] += 1
+        self._changed = True
+        if action == "click_restart_button":
+            state["game_status"] = "restarted"
+        elif action == "play_random_card":
+            card = self.rng.randint(1, 52)
+            state["board_state"]["played_cards"].append(card)
+            state["player_states"]["player1"]["hand"] -= 1
+        elif state["board_state"]["cells"]:
+            cell = f"cell_{self.rng.randrange(len(state['board_state']['cells']))}"
+            state["board_state"]["cells"][cell] += 1
+        return {"status": "ok", "tick": state["tick"]}
+
+
+    def _state_since(self, since) -> dict:
+        """
+        Answers get_state_since: the changes since a version this app handed out
+        earlier as a JSON patch, or the full state when that version is unknown.
+        """
+        if self._changed:
+            self.state_version += 1
+            self._versions[self.state_version] = copy.deepcopy(self.state)
+            while len(self._versions) > 8:
+                self._versions.popitem(last=False)
+            self._changed = False
+        current = self._versions[self.state_version]
+        if since in self._versions:
+            return {"state_version": self.state_version, "patch": json_diff(self._versions[since], current)}
+        return {"state_version": self.state_version, "state": copy.deepcopy(current)}
+
+
+def serve_cli(app: StandInApp):
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            response = app.handle(json.loads(line))
+        except json.JSONDecodeError as e:
+            response = {"error": f"Invalid JSON: {e}"}
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+
+
+async def _serve_frames(app: StandInApp, reader, writer):
+    try:
+        while True:
+            header = await reader.readexactly(FRAME_HEADER.size)
+            (length,) = FRAME_HEADER.unpack(header)
+            if length > MAX_FRAME_BYTES:
+                break
+            payload = await reader.readexactly(length)
+            # Reply in whichever codec the request used.
+            codec = "json" if payload[:1] == b"{" else "msgpack"
+            response = app.handle(decode_payload(payload))
+            body = encode_payload(response, codec)
+            writer.write(FRAME_HEADER.pack(len(body)) + body)
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve_socket(app: StandInApp, address: str):
+    kind, target = parse_address(address)
+
+    async def on_connect(reader, writer):
+        await _serve_frames(app, reader, writer)
+
+    if kind == "unix":
+        server = await asyncio.start_unix_server(on_connect, target, limit=MAX_FRAME_BYTES)
+    else:
+        server = await asyncio.start_server(on_connect, *target, limit=MAX_FRAME_BYTES)
+    logger.info(f"Socket bridge listening on {address}")
+    async with server:
+        await server.serve_forever()
+
+
+def make_http_server(app: StandInApp, address: str) -> ThreadingHTTPServer:
+    _, (host, port) = parse_address(address)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out in separate writes; without this, Nagle's
+        # algorithm stalls every keep-alive response on the client's delayed ACK.
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                command = json.loads(self.rfile.read(length))
+            except json.JSONDecodeError as e:
+                self._reply(400, {"error": f"Invalid JSON: {e}"})
+                return
+            if isinstance(command, list):
+                # Batch endpoint: a JSON array of commands, answered in order.
+                self._reply(200, [app.handle(item) for item in command])
+            else:
+                self._reply(200, app.handle(command))
+
+        def _reply(self, status: int, payload):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stand-in app for TestAgent tests and benchmarks.")
+    parser.add_argument("--cli", action="store_true", help="Serve JSON lines on stdin/stdout")
+    parser.add_argument("--tcp", help="Serve framed commands on host:port")
+    parser.add_argument("--unix", help="Serve framed commands on a Unix socket path")
+    parser.add_argument("--http", help="Serve HTTP POST commands on host:port")
+    parser.add_argument("--state-size", type=int, default=0, help="Extra board cells in the state")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+
+    app = StandInApp(state_size=args.state_size)
+    if args.cli:
+        serve_cli(app)
+        return
+    if not (args.tcp or args.unix or args.http):
+        parser.error("choose at least one of --cli, --tcp, --unix or --http")
+    if args.http:
+        http_server = make_http_server(app, args.http)
+        threading.Thread(target=http_server.serve_forever, daemon=True).start()
+        logger.info(f"HTTP bridge listening on {args.http}")
+
+    async def serve_all():
+        addresses = [args.tcp, f"unix://{args.unix}" if args.unix else None]
+        servers = [serve_socket(app, address) for address in addresses if address]
+        if servers:
+            await asyncio.gather(*servers)
+        else:
+            await asyncio.Event().wait()
+
+    try:
+        asyncio.run(serve_all())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
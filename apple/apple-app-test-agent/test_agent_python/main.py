@@ -1,13 +1,16 @@
+import itertools
 import json
 import logging
 import os
-import subprocess
+import threading
 import time
 import traceback
-import urllib.request
-import urllib.error
 from datetime import datetime
 
+from metrics import LatencyRecorder
+from snapshots import SnapshotStore, apply_patch
+from transports import AsyncCLITransport, HTTPTransport, SocketTransport, TransportError, TransportTimeout
+
 # Configure Artifact Directories
 artifacts_dir = "artifacts"
 log_dir = os.path.join(artifacts_dir, "logs")
@@ -38,6 +41,32 @@ ch.setFormatter(formatter)
 logger.addHandler(fh)
 logger.addHandler(ch)
 
+# Several agents may run in parallel threads (see runner.py) and share these files.
+_artifact_lock = threading.Lock()
+# Each agent writes its own snapshot file (see snapshots.py).
+_agent_numbers = itertools.count()
+# Commands that only read state; they are not part of the replay sequence.
+STATE_ACTIONS = ("get_state", "get_state_since")
+
+
+def build_report(results: list, elapsed_sec: float, latencies: LatencyRecorder = None) -> dict:
+    """
+    Summarizes scenario results (from TestAgent.run_scenario) into a run report.
+    With a LatencyRecorder, "latency" holds a round-trip histogram per action.
+    """
+    passed = sum(1 for result in results if result["passed"])
+    report = {
+        "total": len(results),
+        "passed": passed,
+        "failed": len(results) - passed,
+        "elapsed_sec": round(elapsed_sec, 4),
+        "runs_per_sec": round(len(results) / elapsed_sec, 2) if elapsed_sec > 0 else None,
+        "results": results,
+    }
+    if latencies is not None:
+        report["latency"] = latencies.summary()
+    return report
+
 class TestAgent:
     def __init__(self, 
                  app_executable_path: str = None, 
@@ -45,15 +74,34 @@ class TestAgent:
                  base_url: str = "http://localhost:8080",
                  action_timeout_sec: float = 5.0,
                  max_steps_per_scenario: int = 100,
-                 rng_seed: int = None):
+                 rng_seed: int = None,
+                 ready_timeout_sec: float = 10.0,
+                 app_pool=None,
+                 socket_address: str = "tcp://127.0.0.1:8765",
+                 socket_codec: str = "json",
+                 http_pool_size: int = 4,
+                 http_batch_url: str = None,
+                 use_state_deltas: bool = True):
         """
         Initializes the Test Agent.
         :param app_executable_path: Path to the Apple App executable (e.g. built CLI tool)
         :param connection_mode: "cli", "http", or "socket" (default uses subprocess CLI)
+                                "socket" keeps one framed TCP/Unix socket connection open.
         :param base_url: The URL of the Simulator Bridge (if in http mode)
         :param action_timeout_sec: Maximum time to wait for the app to respond to an action.
         :param max_steps_per_scenario: Safety guard against infinite testing loops.
         :param rng_seed: Fixed seed for deterministic testing across runs.
+        :param ready_timeout_sec: Maximum time for a freshly launched app to answer its first ping.
+        :param app_pool: Optional AppProcessPool (app_pool.py) of warm app processes to borrow
+                         from instead of launching a new process per scenario.
+        :param socket_address: "tcp://host:port" or "unix:///path" of the app (if in socket mode)
+        :param socket_codec: Frame payload encoding in socket mode: "json" or "msgpack".
+        :param http_pool_size: Keep-alive connections kept open to the Simulator Bridge (http mode).
+        :param http_batch_url: Optional bridge endpoint accepting a JSON array of commands
+                               (http mode); batches are then sent in a single POST.
+        :param use_state_deltas: Fetch snapshot and crash states with the app's optional
+                                 get_state_since command (falls back to get_state
+                                 for apps that reject or do not know it).
         """
         self.app_executable_path = app_executable_path
         self.connection_mode = connection_mode
@@ -61,43 +109,88 @@ class TestAgent:
         self.action_timeout_sec = action_timeout_sec
         self.max_steps_per_scenario = max_steps_per_scenario
         self.rng_seed = rng_seed
-        self.process = None
+        self.ready_timeout_sec = ready_timeout_sec
+        self.app_pool = app_pool
+        self.socket_address = socket_address
+        self.socket_codec = socket_codec
+        self.http_pool_size = http_pool_size
+        self.http_batch_url = http_batch_url
+        self.use_state_deltas = use_state_deltas
+        self._state_deltas_confirmed = False
+        self.transport = None
+        self.latencies = LatencyRecorder()
+        self.snapshot_store = None
+        self._agent_number = next(_agent_numbers)
+        self._state_cache = None
+        self._state_version = None
+        self._stored_version = None
         self.action_log = []
         logger.info(f"TestAgent initialized with mode: {connection_mode}")
 
     def start_app(self):
         """Starts the Apple App process."""
         self.action_log = [] # Reset log per scenario/run
+        # A new or reset app instance: state versions from the last one are meaningless.
+        self._state_cache = self._state_version = self._stored_version = None
         
-        if self.connection_mode == "cli":
+        if self.connection_mode == "cli" and self.app_pool:
+            logger.info("Borrowing a warm app process from the pool")
+            self.transport = self.app_pool.acquire()
+        elif self.connection_mode == "cli":
             if not self.app_executable_path:
                 raise ValueError("app_executable_path is required for CLI connection mode.")
             logger.info(f"Starting app at {self.app_executable_path}")
-            self.process = subprocess.Popen(
-                [self.app_executable_path],
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
+            self.transport = AsyncCLITransport(
+                self.app_executable_path,
+                action_timeout_sec=self.action_timeout_sec
+            )
+            self._connect_transport()
+        elif self.connection_mode == "socket":
+            logger.info(f"Connecting to app at {self.socket_address}")
+            self.transport = SocketTransport(
+                self.socket_address,
+                action_timeout_sec=self.action_timeout_sec,
+                codec=self.socket_codec,
+                connect_timeout_sec=self.ready_timeout_sec
+            )
+            self._connect_transport()
+        elif self.connection_mode == "http":
+            logger.info(f"Connecting to Simulator Bridge at {self.base_url}")
+            self.transport = HTTPTransport(
+                self.base_url,
+                action_timeout_sec=self.action_timeout_sec,
+                pool_size=self.http_pool_size,
+                batch_url=self.http_batch_url
             )
-            time.sleep(1) # wait for startup
+            self.transport.start()
         else:
-            logger.info(f"Connecting to app via {self.connection_mode}")
-            # Implement HTTP or Socket connection here
-            pass
+            raise ValueError(f"Unknown connection mode: {self.connection_mode}")
+
+    def _connect_transport(self):
+        """Starts self.transport and waits for the app's readiness handshake."""
+        self.transport.start()
+        try:
+            self.transport.wait_ready(self.ready_timeout_sec)
+        except Exception:
+            self.transport.close()
+            self.transport = None
+            raise
 
     def stop_app(self):
         """Stops the Apple App."""
-        logger.info("Stopping the app...")
-        if self.process:
-            self.process.terminate()
-            self.process.wait()
-            self.process = None
+        if self.transport and self.app_pool:
+            logger.info("Returning the app process to the pool...")
+            self.app_pool.release(self.transport)
+            self.transport = None
+        elif self.transport:
+            logger.info("Stopping the app...")
+            self.transport.close()
+            self.transport = None
 
     def _save_repro_steps(self):
         """Saves current action sequence for deterministic replay."""
         if self.action_log:
-            with open(repro_file, 'w') as f:
+            with _artifact_lock, open(repro_file, 'w') as f:
                 json.dump({"seed": self.rng_seed, "sequence": self.action_log}, f, indent=2)
 
     def _send_command(self, command: dict) -> dict:
@@ -105,49 +198,65 @@ class TestAgent:
         logger.debug(f"Sending command: {command}")
         
         # Keep track for replay / debugging
-        if command.get("action") != "get_state":
+        if command.get("action") not in STATE_ACTIONS:
             self.action_log.append(command)
         
-        if self.connection_mode == "cli":
-            if not self.process:
-                raise RuntimeError("App is not running.")
-            
-            req_str = json.dumps(command) + "\n"
-            self.process.stdin.write(req_str)
-            self.process.stdin.flush()
-            
-            # Read response (Using naive readline here. In production, wrap in thread/poll with select for timeout)
-            # A true timeout implementation would use select.select on self.process.stdout
-            response_str = self.process.stdout.readline()
-            if not response_str:
-                stderr_output = self.process.stderr.read()
-                raise RuntimeError(f"App closed unexpectedly. Stderr: {stderr_output}")
-            
-            try:
-                resp = json.loads(response_str)
-                logger.debug(f"Received response: {resp}")
-                return resp
-            except json.JSONDecodeError as e:
-                raise RuntimeError(f"Failed to parse JSON response: {response_str}") from e
-        elif self.connection_mode == "http":
-            req_data = json.dumps(command).encode('utf-8')
-            req = urllib.request.Request(self.base_url, data=req_data, method='POST')
-            req.add_header('Content-Type', 'application/json')
-            
-            try:
-                with urllib.request.urlopen(req, timeout=self.action_timeout_sec) as response:
-                    resp_str = response.read().decode('utf-8')
-                    resp = json.loads(resp_str)
-                    logger.debug(f"Received HTTP response: {resp}")
-                    return resp
-            except urllib.error.URLError as e:
-                raise RuntimeError(f"HTTP Connection failed to {self.base_url}: {e.reason}") from e
-            except Exception as e:
-                raise RuntimeError(f"HTTP Request failed: {e}") from e
-        else:
-            # Implement Socket connection here
-            pass
-        return {}
+        if not self.transport:
+            raise RuntimeError("App is not running.")
+        started = time.perf_counter()
+        # Raises TransportError / TransportTimeout (RuntimeErrors) on failure.
+        response = self.transport.request(command)
+        self.latencies.record(command.get("action"), time.perf_counter() - started)
+        return response
+
+    def _send_batch(self, commands: list) -> list:
+        """Sends several JSON commands in one batch and returns the responses in order."""
+        logger.debug(f"Sending batch of {len(commands)} commands")
+        if not self.transport:
+            raise RuntimeError("App is not running.")
+        self.action_log.extend(command for command in commands if command.get("action") not in STATE_ACTIONS)
+        started = time.perf_counter()
+        responses = self.transport.request_batch(commands)
+        # Attribute the batch round trip evenly to the commands it carried.
+        per_command = (time.perf_counter() - started) / max(1, len(commands))
+        for command in commands:
+            self.latencies.record(command.get("action"), per_command)
+        return responses
+
+    def send_actions(self, actions: list, include_state: bool = False) -> list:
+        """
+        Sends a sequence of user actions in one batch (about one round trip
+        instead of one per action) and returns all responses in order.
+        :param actions: Action names, (action, data) tuples, or command dicts
+                        such as {"action": "set_condition", "data": {...}}.
+        :param include_state: Also fetch the full state after the final action;
+                              it is returned as the last element.
+        """
+        commands = []
+        for action in actions:
+            if isinstance(action, dict):
+                commands.append(action)
+            elif isinstance(action, (tuple, list)):
+                action_type, action_data = action
+                commands.append({"action": action_type, "data": action_data} if action_data
+                                else {"action": action_type})
+            else:
+                commands.append({"action": action})
+        if include_state:
+            commands.append({"action": "get_state"})
+        logger.info(f"Sending {len(commands)} commands in one batch")
+        return self._send_batch(commands)
+
+    def pipeline(self) -> "ActionPipeline":
+        """
+        Collects commands and sends them together, e.g.:
+            with agent.pipeline() as batch:
+                batch.set_condition({"player1_score": 10})
+                batch.send_user_action("play_random_card")
+                batch.get_all_information()
+            state = batch.responses[-1]
+        """
+        return ActionPipeline(self)
 
     def get_all_information(self) -> dict:
         """
@@ -168,15 +277,68 @@ class TestAgent:
             "data": condition_data
         })
         
-    def save_snapshot(self, tag: str, state_data: dict = None):
-        """Saves a state snapshot to artifacts."""
+    def _fetch_state(self):
+        """
+        Returns (state, patch): the full current state, plus the JSON patch from
+        the previously fetched state when the app answered get_state_since with one.
+        Apps without get_state_since get a plain get_state from then on.
+        """
+        if self.use_state_deltas:
+            since = self._state_version if self._state_cache is not None else None
+            command = {"action": "get_state_since", "data": {"since": since}}
+            try:
+                response = self._send_command(command)
+            except TransportTimeout:
+                raise
+            except TransportError as e:
+                # Until the app has answered one get_state_since, an error reply
+                # (e.g. an HTTP bridge's 4xx for an unknown action) means no support.
+                if self._state_deltas_confirmed:
+                    raise
+                response = None
+                logger.debug(f"get_state_since probe failed: {e}")
+            if isinstance(response, dict) and "state_version" in response:
+                self._state_deltas_confirmed = True
+                patch = None
+                if "patch" in response and since is not None:
+                    patch = response["patch"]
+                    state = apply_patch(self._state_cache, patch)
+                else:
+                    state = response["state"]
+                self._state_cache, self._state_version = state, response["state_version"]
+                return state, patch
+            logger.info("App does not support get_state_since; snapshots use get_state.")
+            self.use_state_deltas = False
+        return self.get_all_information(), None
+
+    def save_snapshot(self, tag: str, state_data: dict = None) -> int:
+        """
+        Saves a state snapshot to the agent's SnapshotStore (a compressed file
+        of deltas in the snapshots artifacts folder) and returns its number.
+        """
+        patch = None
         if not state_data:
-            state_data = self.get_all_information()
-        
-        filename = os.path.join(snapshot_dir, f"snapshot_{tag}_{int(time.time()*1000)}.json")
-        with open(filename, 'w') as f:
-            json.dump(state_data, f, indent=2)
-        logger.info(f"Snapshot saved: {filename}")
+            previous_version = self._state_version
+            state_data, patch = self._fetch_state()
+            # The app's patch is only reusable if the store's last snapshot is its base.
+            if patch is not None and previous_version != self._stored_version:
+                patch = None
+            self._stored_version = self._state_version
+        else:
+            self._stored_version = None
+
+        if self.snapshot_store is None:
+            self.snapshot_store = SnapshotStore(os.path.join(
+                snapshot_dir, f"snapshots_{timestamp}_{self._agent_number}.jsonl.gz"
+            ))
+        seq = self.snapshot_store.add(tag, state_data, patch=patch)
+        logger.info(f"Snapshot saved: {tag} (#{seq} in {self.snapshot_store.path})")
+        return seq
+
+    def close_snapshots(self):
+        """Finishes the snapshot file; later snapshots are appended to it."""
+        if self.snapshot_store:
+            self.snapshot_store.close()
 
     def send_user_action(self, action_type: str, action_data: dict = None) -> dict:
         """Sends a simulated user interface interaction."""
@@ -186,38 +348,60 @@ class TestAgent:
         logger.info(f"Sending user action: {action_type} with data: {action_data}")
         return self._send_command(cmd)
 
-    def run_tests(self, scenarios: list, repeat_count: int = 1):
+    def run_scenario(self, scenario_func, iteration: int = 0) -> dict:
+        """
+        Runs one scenario against a freshly started app and returns its result:
+        {"scenario", "iteration", "passed", "error", "duration_sec"}.
+        """
+        scenario_name = scenario_func.__name__
+        started = time.perf_counter()
+        error = None
+        try:
+            self.start_app()
+            
+            # If deterministic replay is requested
+            if self.rng_seed is not None:
+                self.set_condition({"rng_seed": self.rng_seed})
+                
+            # Run the actual test scenario logic
+            scenario_func(self)
+            
+            # Save normal execution path
+            self._save_repro_steps()
+            logger.info(f"Scenario {scenario_name} completed successfully.")
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            logger.error(f"Scenario {scenario_name} failed with exception: {e}")
+            self.handle_crash(e, scenario_name)
+        finally:
+            self.stop_app()
+        return {
+            "scenario": scenario_name,
+            "iteration": iteration,
+            "passed": error is None,
+            "error": error,
+            "duration_sec": round(time.perf_counter() - started, 4),
+        }
+
+    def run_tests(self, scenarios: list, repeat_count: int = 1) -> dict:
         """
         5. Runs a suite of scenarios, potentially repeating them.
+        Returns a report with one result per scenario run (see build_report).
         """
         logger.info(f"Starting test run. Total scenarios: {len(scenarios)}, Repeat count: {repeat_count}")
+        started = time.perf_counter()
+        results = []
+        self.latencies.reset()
         
         for iteration in range(repeat_count):
             logger.info(f"--- Starting Iteration {iteration + 1}/{repeat_count} ---")
             for idx, scenario_func in enumerate(scenarios):
-                scenario_name = scenario_func.__name__
-                logger.info(f"Running Scenario {idx + 1}: {scenario_name}")
-                
-                try:
-                    self.start_app()
-                    
-                    # If deterministic replay is requested
-                    if self.rng_seed is not None:
-                        self.set_condition({"rng_seed": self.rng_seed})
-                        
-                    # Run the actual test scenario logic
-                    scenario_func(self)
-                    
-                    # Save normal execution path
-                    self._save_repro_steps()
-                    logger.info(f"Scenario {scenario_name} completed successfully.")
-                except Exception as e:
-                    logger.error(f"Scenario {scenario_name} failed with exception: {e}")
-                    self.handle_crash(e, scenario_name)
-                finally:
-                    self.stop_app()
+                logger.info(f"Running Scenario {idx + 1}: {scenario_func.__name__}")
+                results.append(self.run_scenario(scenario_func, iteration))
                     
             logger.info(f"--- Finished Iteration {iteration + 1}/{repeat_count} ---")
+        self.close_snapshots()
+        return build_report(results, time.perf_counter() - started, self.latencies)
 
     def handle_crash(self, exception: Exception, context: str):
         """
@@ -233,15 +417,56 @@ class TestAgent:
             "traceback": traceback.format_exc()
         }
         
-        # Try to capture last known state if possible
+        # Try to capture last known state if possible (as a delta snapshot)
         try:
-           crash_data["last_known_state"] = self.get_all_information()
+           seq = self.save_snapshot(f"crash_{context}")
+           crash_data["last_known_state"] = {"snapshot_file": self.snapshot_store.path, "seq": seq}
         except Exception as state_exc:
            crash_data["last_known_state"] = f"Failed to retrieve state: {state_exc}"
            
-        with open(crash_file, 'a') as f:
+        with _artifact_lock, open(crash_file, 'a') as f:
             f.write(json.dumps(crash_data, indent=2) + "\n")
             
         self._save_repro_steps()
             
         logger.critical(f"Crash report saved to: {crash_file}")
+
+
+class ActionPipeline:
+    """
+    Queues TestAgent commands and sends them in one batch on execute() (or when
+    a `with` block exits without an exception). Mirrors TestAgent's methods.
+    """
+
+    def __init__(self, agent: TestAgent):
+        self.agent = agent
+        self.commands = []
+        self.responses = None
+
+    def send_user_action(self, action_type: str, action_data: dict = None) -> "ActionPipeline":
+        command = {"action": action_type}
+        if action_data:
+            command["data"] = action_data
+        self.commands.append(command)
+        return self
+
+    def set_condition(self, condition_data: dict) -> "ActionPipeline":
+        self.commands.append({"action": "set_condition", "data": condition_data})
+        return self
+
+    def get_all_information(self) -> "ActionPipeline":
+        self.commands.append({"action": "get_state"})
+        return self
+
+    def execute(self) -> list:
+        """Sends the queued commands and returns their responses in order."""
+        commands, self.commands = self.commands, []
+        self.responses = self.agent._send_batch(commands) if commands else []
+        return self.responses
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.execute()
@@ -0,0 +1,106 @@
+"""
+Per-action latency histograms for TestAgent run reports.
+
+Latencies are counted into fixed logarithmic buckets (1-2-5 steps from 10us
+to 10s) rather than stored, so memory stays constant however long a stress
+run is, and histograms from parallel workers can simply be added together.
+Percentiles are reported as the upper bound of the bucket they fall in.
+"""
+import bisect
+import threading
+
+# Bucket upper bounds in seconds: 10us, 20us, 50us, 100us, ... 10s; the last bucket is open.
+BUCKET_BOUNDS = [
+    mantissa * 10.0 ** exponent
+    for exponent in range(-5, 1)
+    for mantissa in (1, 2, 5)
+] + [10.0]
+
+
+def _format_bound(seconds: float) -> str:
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:g}us"
+    if seconds < 1:
+        return f"{seconds * 1e3:g}ms"
+    return f"{seconds:g}s"
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.total = 0
+        self.sum_sec = 0.0
+        self.max_sec = 0.0
+
+    def record(self, seconds: float):
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.total += 1
+        self.sum_sec += seconds
+        self.max_sec = max(self.max_sec, seconds)
+
+    def merge(self, other: "LatencyHistogram"):
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.total += other.total
+        self.sum_sec += other.sum_sec
+        self.max_sec = max(self.max_sec, other.max_sec)
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound (seconds) of the bucket holding the given fraction of samples (at most max)."""
+        if not self.total:
+            return 0.0
+        rank = fraction * self.total
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= rank:
+                bound = BUCKET_BOUNDS[index] if index < len(BUCKET_BOUNDS) else self.max_sec
+                return min(bound, self.max_sec)
+        return self.max_sec
+
+    def summary(self) -> dict:
+        buckets = {}
+        for index, count in enumerate(self.counts):
+            if count:
+                label = (f"<={_format_bound(BUCKET_BOUNDS[index])}" if index < len(BUCKET_BOUNDS)
+                         else f">{_format_bound(BUCKET_BOUNDS[-1])}")
+                buckets[label] = count
+        return {
+            "count": self.total,
+            "mean_ms": round(self.sum_sec / self.total * 1e3, 3) if self.total else 0.0,
+            "p50_ms": round(self.percentile(0.50) * 1e3, 3),
+            "p95_ms": round(self.percentile(0.95) * 1e3, 3),
+            "p99_ms": round(self.percentile(0.99) * 1e3, 3),
+            "max_ms": round(self.max_sec * 1e3, 3),
+            "buckets": buckets,
+        }
+
+
+class LatencyRecorder:
+    """One LatencyHistogram per action name; safe to record from several threads."""
+
+    def __init__(self):
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def record(self, action: str, seconds: float):
+        with self._lock:
+            histogram = self.histograms.get(action)
+            if histogram is None:
+                histogram = self.histograms[action] = LatencyHistogram()
+            histogram.record(seconds)
+
+    def merge(self, other: "LatencyRecorder"):
+        with other._lock:
+            items = list(other.histograms.items())
+        with self._lock:
+            for action, histogram in items:
+                self.histograms.setdefault(action, LatencyHistogram()).merge(histogram)
+
+    def reset(self):
+        with self._lock:
+            self.histograms = {}
+
+    def summary(self) -> dict:
+        """{action: {"count", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms", "buckets"}}"""
+        with self._lock:
+            return {action: self.histograms[action].summary() for action in sorted(self.histograms)}
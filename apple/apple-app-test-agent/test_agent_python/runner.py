@@ -0,0 +1,138 @@
+"""
+Parallel scenario runner: spreads scenario x iteration work items over several
+independent app instances and merges the results into one report.
+
+Each worker owns its own TestAgent (and therefore its own app subprocess or
+Simulator Bridge URL) and pulls work items from a shared queue, so a slow
+scenario on one instance never holds up the others.
+"""
+import logging
+import os
+import queue
+import threading
+import time
+
+from app_pool import AppProcessPool
+from main import TestAgent, build_report
+from metrics import LatencyRecorder
+
+logger = logging.getLogger("TestAgent.Runner")
+
+
+class ParallelRunner:
+    def __init__(self, agents: list):
+        """
+        :param agents: One TestAgent per app instance. They must not share an
+                       app process or Simulator Bridge URL.
+        """
+        if not agents:
+            raise ValueError("ParallelRunner needs at least one TestAgent.")
+        self.agents = agents
+        self.app_pool = None
+
+    @classmethod
+    def for_cli(cls,
+                app_executable_path: str,
+                workers: int = None,
+                warm: bool = True,
+                max_uses: int = 100,
+                **agent_kwargs):
+        """
+        Builds a runner that runs `workers` copies of the CLI app (default: CPU count).
+        With warm=True the copies live in a shared AppProcessPool and are reset
+        between scenarios instead of being relaunched; call close() when done.
+        """
+        workers = workers or os.cpu_count() or 1
+        app_pool = None
+        if warm:
+            app_pool = AppProcessPool(
+                app_executable_path,
+                size=workers,
+                max_uses=max_uses,
+                action_timeout_sec=agent_kwargs.get("action_timeout_sec", 5.0),
+                ready_timeout_sec=agent_kwargs.get("ready_timeout_sec", 10.0),
+            )
+            app_pool.start()
+        runner = cls([
+            TestAgent(app_executable_path=app_executable_path,
+                      connection_mode="cli",
+                      app_pool=app_pool,
+                      **agent_kwargs)
+            for _ in range(workers)
+        ])
+        runner.app_pool = app_pool
+        return runner
+
+    def close(self):
+        """Stops the warm app processes, if this runner owns a pool."""
+        if self.app_pool:
+            self.app_pool.close()
+            self.app_pool = None
+
+    @classmethod
+    def for_http(cls, base_urls: list, **agent_kwargs):
+        """Builds a runner with one worker per Simulator Bridge URL."""
+        return cls([
+            TestAgent(connection_mode="http", base_url=base_url, **agent_kwargs)
+            for base_url in base_urls
+        ])
+
+    def run(self, scenarios: list, repeat_count: int = 1) -> dict:
+        """
+        Runs every scenario repeat_count times across all workers.
+        Returns the same report shape as TestAgent.run_tests, plus per-worker counts.
+        """
+        work = queue.Queue()
+        for iteration in range(repeat_count):
+            for order, scenario_func in enumerate(scenarios):
+                work.put((iteration, order, scenario_func))
+        logger.info(
+            f"Starting parallel run: {work.qsize()} work items across {len(self.agents)} workers"
+        )
+
+        results = []
+        results_lock = threading.Lock()
+        per_worker = [0] * len(self.agents)
+        for agent in self.agents:
+            agent.latencies.reset()
+
+        def worker(index: int, agent: TestAgent):
+            while True:
+                try:
+                    iteration, order, scenario_func = work.get_nowait()
+                except queue.Empty:
+                    return
+                result = agent.run_scenario(scenario_func, iteration)
+                result["worker"] = index
+                with results_lock:
+                    results.append((iteration, order, result))
+                    per_worker[index] += 1
+
+        started = time.perf_counter()
+        threads = [
+            threading.Thread(target=worker, args=(index, agent), name=f"TestAgentWorker-{index}")
+            for index, agent in enumerate(self.agents)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for agent in self.agents:
+            agent.close_snapshots()
+
+        results.sort(key=lambda item: item[:2])
+        latencies = LatencyRecorder()
+        for agent in self.agents:
+            latencies.merge(agent.latencies)
+        report = build_report(
+            [result for _, _, result in results], time.perf_counter() - started, latencies
+        )
+        report["workers"] = len(self.agents)
+        report["runs_per_worker"] = per_worker
+        if self.app_pool:
+            report["app_pool"] = self.app_pool.stats()
+        logger.info(
+            f"Parallel run finished: {report['passed']}/{report['total']} passed "
+            f"in {report['elapsed_sec']}s ({report['runs_per_sec']} runs/s)"
+        )
+        return report
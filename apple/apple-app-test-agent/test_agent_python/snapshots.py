@@ -0,0 +1,258 @@
+"""
+Delta-encoded state snapshots.
+
+Instead of writing every snapshot as a full, pretty-printed JSON file,
+SnapshotStore appends records to one gzip-compressed JSON-lines file:
+a full keyframe state, followed by RFC 6902 JSON-patch deltas, each against
+the snapshot before it. A new keyframe is written when a delta would be
+large relative to the state, or after max_chain deltas, so reconstructing
+any snapshot replays a bounded number of patches.
+
+The file is flushed after every record, so it stays readable when a run is
+killed. Reconstruct snapshots offline with:
+    python snapshots.py artifacts/state_snapshots/snapshots_<run>.jsonl.gz
+    python snapshots.py <file> --tag crash_scenario_name
+    python snapshots.py <file> --seq 12 --out state.json
+"""
+import argparse
+import gzip
+import json
+import sys
+import threading
+import time
+
+_MISSING = object()
+
+
+def _escape(token: str) -> str:
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def json_diff(old, new, path: str = "") -> list:
+    """
+    Returns RFC 6902 operations (add / remove / replace) that turn `old` into `new`.
+    Objects are diffed key by key; lists element by element when their length
+    is unchanged or they only grew or shrank at the end, otherwise replaced whole.
+    """
+    if old is new:
+        return []
+    if type(old) is not type(new):
+        return [{"op": "replace", "path": path, "value": new}]
+    if isinstance(old, dict):
+        ops = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            old_value = old.get(key, _MISSING)
+            if old_value is _MISSING:
+                ops.append({"op": "add", "path": f"{path}/{_escape(key)}", "value": value})
+            else:
+                ops.extend(json_diff(old_value, value, f"{path}/{_escape(key)}"))
+        return ops
+    if isinstance(old, list):
+        shared = min(len(old), len(new))
+        if len(old) != len(new) and old[:shared] != new[:shared]:
+            return [{"op": "replace", "path": path, "value": new}]
+        ops = []
+        for index in range(shared):
+            ops.extend(json_diff(old[index], new[index], f"{path}/{index}"))
+        for index in range(shared, len(new)):
+            ops.append({"op": "add", "path": f"{path}/{index}", "value": new[index]})
+        for index in range(len(old) - 1, shared - 1, -1):
+            ops.append({"op": "remove", "path": f"{path}/{index}"})
+        return ops
+    return [] if old == new else [{"op": "replace", "path": path, "value": new}]
+
+
+def apply_patch(document, patch: list):
+    """
+    Applies RFC 6902 add / remove / replace operations and returns the new
+    document. `document` is not modified: only the containers on the patched
+    paths are copied, the rest is shared with the original.
+    """
+    root = [document]
+    copied = set()
+
+    def writable(container, key):
+        child = container[key]
+        if id(child) not in copied:
+            child = dict(child) if isinstance(child, dict) else list(child)
+            container[key] = child
+            copied.add(id(child))
+        return child
+
+    for op in patch:
+        tokens = [_unescape(token) for token in op["path"].split("/")[1:]] if op["path"] else []
+        if not tokens:
+            if op["op"] == "remove":
+                raise ValueError("Cannot remove the whole document")
+            root[0] = op["value"]
+            continue
+        container = writable(root, 0)
+        for token in tokens[:-1]:
+            container = writable(container, int(token) if isinstance(container, list) else token)
+        last = tokens[-1]
+        if isinstance(container, list):
+            if op["op"] == "add":
+                if last == "-":
+                    container.append(op["value"])
+                else:
+                    container.insert(int(last), op["value"])
+            elif op["op"] == "replace":
+                container[int(last)] = op["value"]
+            elif op["op"] == "remove":
+                del container[int(last)]
+            else:
+                raise ValueError(f"Unsupported patch operation: {op['op']}")
+        elif op["op"] in ("add", "replace"):
+            container[last] = op["value"]
+        elif op["op"] == "remove":
+            del container[last]
+        else:
+            raise ValueError(f"Unsupported patch operation: {op['op']}")
+    return root[0]
+
+
+def _open(path: str, mode: str):
+    return gzip.open(path, mode) if path.endswith(".gz") else open(path, mode)
+
+
+def read_records(path: str):
+    """Yields the raw records of a snapshot file, tolerating a truncated tail."""
+    with _open(path, "rb") as f:
+        try:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    return
+        except EOFError:
+            # The writer was killed before closing the gzip stream.
+            return
+
+
+def read_snapshots(path: str):
+    """Yields ({"seq", "tag", "time"}, state) for every snapshot in the file, in order."""
+    state = None
+    for record in read_records(path):
+        if "state" in record:
+            state = record["state"]
+        else:
+            state = apply_patch(state, record["patch"])
+        yield {"seq": record["seq"], "tag": record["tag"], "time": record["time"]}, state
+
+
+class SnapshotStore:
+    def __init__(self, path: str, max_chain: int = 100, rebase_ratio: float = 0.5):
+        """
+        :param path: Snapshot file; gzip-compressed when it ends in ".gz".
+        :param max_chain: Maximum deltas between two keyframes.
+        :param rebase_ratio: Write a keyframe instead of a delta once the delta's
+                             size exceeds this fraction of the last keyframe's.
+        """
+        self.path = path
+        self.max_chain = max_chain
+        self.rebase_ratio = rebase_ratio
+        self.index = []
+        self.keyframes = 0
+        self.bytes_written = 0
+        self._file = None
+        self._latest = None
+        self._chain = 0
+        self._keyframe_bytes = 0
+        self._lock = threading.Lock()
+
+    def add(self, tag: str, state: dict, patch: list = None) -> int:
+        """
+        Records a snapshot and returns its sequence number.
+        :param patch: Optional JSON patch from the previously added state to
+                      `state` (e.g. from the app's get_state_since); computed
+                      with json_diff when omitted.
+        """
+        with self._lock:
+            seq = len(self.index)
+            record = {"seq": seq, "tag": tag, "time": int(time.time() * 1000)}
+            patch_json = None
+            if self._latest is not None and self._chain < self.max_chain:
+                if patch is None:
+                    patch = json_diff(self._latest, state)
+                patch_json = json.dumps(patch, separators=(",", ":"))
+                if len(patch_json) > self.rebase_ratio * self._keyframe_bytes:
+                    patch_json = None
+            if patch_json is None:
+                state_json = json.dumps(state, separators=(",", ":"))
+                line = f"{json.dumps(record)[:-1]}, \"state\": {state_json}}}\n"
+                # Keep a private copy to diff against; the caller may mutate `state`.
+                self._latest = json.loads(state_json)
+                self._keyframe_bytes = len(state_json)
+                self._chain = 0
+                self.keyframes += 1
+            else:
+                line = f"{json.dumps(record)[:-1]}, \"patch\": {patch_json}}}\n"
+                self._latest = apply_patch(self._latest, json.loads(patch_json))
+                self._chain += 1
+            if self._file is None:
+                self._file = _open(self.path, "ab")
+            data = line.encode("utf-8")
+            self._file.write(data)
+            self._file.flush()
+            self.bytes_written += len(data)
+            self.index.append((seq, tag))
+            return seq
+
+    def get(self, seq: int = None, tag: str = None) -> dict:
+        """Reconstructs a snapshot by sequence number, or the latest one with `tag`."""
+        if seq is None:
+            matches = [number for number, name in self.index if name == tag]
+            if not matches:
+                raise KeyError(f"No snapshot tagged {tag!r}")
+            seq = matches[-1]
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+            for meta, state in read_snapshots(self.path):
+                if meta["seq"] == seq:
+                    return state
+        raise KeyError(f"No snapshot #{seq} in {self.path}")
+
+    def close(self):
+        """Finishes the file; a later add() appends to it again."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List or reconstruct delta-encoded snapshots.")
+    parser.add_argument("path", help="Snapshot file written by SnapshotStore")
+    parser.add_argument("--seq", type=int, help="Reconstruct the snapshot with this number")
+    parser.add_argument("--tag", help="Reconstruct the latest snapshot with this tag")
+    parser.add_argument("--out", help="Write the snapshot here instead of stdout")
+    args = parser.parse_args()
+
+    if args.seq is None and args.tag is None:
+        for meta, _ in read_snapshots(args.path):
+            print(f"{meta['seq']:6}  {meta['time']}  {meta['tag']}")
+        return
+    found = None
+    for meta, state in read_snapshots(args.path):
+        if meta["seq"] == args.seq or (args.seq is None and meta["tag"] == args.tag):
+            found = state
+    if found is None:
+        sys.exit("Snapshot not found.")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(found, f, indent=2)
+    else:
+        json.dump(found, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -64,15 +64,16 @@ def scenario_safety_limit_trigger(agent: TestAgent):
     """
     logger.info("Running safety limit trigger scenario...")
     
-    # Loop over the allowed max steps to see if our agent bails out gracefully
+    # Run the allowed max steps to see if our agent bails out gracefully
     # In a real app, an agent might get stuck in a visual loop.
-    for step in range(agent.max_steps_per_scenario + 5):
-        if step >= agent.max_steps_per_scenario:
-            logger.warning("Safety limit reached. Triggering graceful abort.")
-            agent.save_snapshot("safety_abort")
-            raise RuntimeError(f"Infinite loop detected. Reached max steps ({agent.max_steps_per_scenario})")
-            
-        agent.send_user_action("click_useless_button")
+    # All steps plus the final state read go out as one batch (about one round trip).
+    responses = agent.send_actions(
+        ["click_useless_button"] * agent.max_steps_per_scenario,
+        include_state=True
+    )
+    logger.warning("Safety limit reached. Triggering graceful abort.")
+    agent.save_snapshot("safety_abort", responses[-1])
+    raise RuntimeError(f"Infinite loop detected. Reached max steps ({agent.max_steps_per_scenario})")
 
 def scenario_simulator_sync_test(agent: TestAgent):
     """
@@ -118,7 +119,21 @@ if __name__ == "__main__":
     # agent_sim = TestAgent(connection_mode="http", base_url="http://localhost:8080/api")
     # agent_sim.run_tests(scenarios=[scenario_simulator_sync_test], repeat_count=10)
     
+    # Example for parallel stress runs (one app instance per worker):
+    # from runner import ParallelRunner
+    # runner = ParallelRunner.for_cli(app_executable, workers=4, rng_seed=42)
+    # report = runner.run(scenarios=scenarios_to_run, repeat_count=1000)
+    # runner.close()
+    
+    # Example for reusing one warm app process (reset between scenarios):
+    # from app_pool import AppProcessPool
+    # pool = AppProcessPool(app_executable, size=1, max_uses=500)
+    # pool.start()
+    # TestAgent(app_pool=pool, rng_seed=42).run_tests(scenarios_to_run, repeat_count=1000)
+    # pool.close()
+    
     try:
-        agent.run_tests(scenarios=scenarios_to_run, repeat_count=REPEAT_COUNT)
+        report = agent.run_tests(scenarios=scenarios_to_run, repeat_count=REPEAT_COUNT)
+        logger.info(f"Passed {report['passed']}/{report['total']} scenario runs.")
     except KeyboardInterrupt:
         logger.info("Testing interrupted by user.")
@@ -0,0 +1,631 @@
+"""
+Transports used by TestAgent to exchange JSON commands with the app.
+
+Every transport exposes the same small synchronous surface so TestAgent does
+not care how the app is reached:
+- start() / close()
+- request(command, timeout) -> response dict
+- submit(command, timeout) -> concurrent.futures.Future (several may be in flight)
+- request_batch(commands, timeout) -> responses in order, in about one round trip
+"""
+import abc
+import asyncio
+import collections
+import concurrent.futures
+import http.client
+import importlib
+import itertools
+import json
+import logging
+import queue
+import struct
+import threading
+import time
+import urllib.parse
+
+logger = logging.getLogger("TestAgent.Transport")
+
+# Upper bound for a single message read from the app (large state dumps).
+MAX_LINE_BYTES = 64 * 1024 * 1024
+MAX_FRAME_BYTES = MAX_LINE_BYTES
+# Socket frames: 4-byte big-endian payload length, then the payload.
+FRAME_HEADER = struct.Struct(">I")
+CODECS = ("json", "msgpack")
+
+
+class TransportError(RuntimeError):
+    """The app could not be reached, closed the connection, or sent garbage."""
+
+
+class TransportTimeout(TransportError):
+    """The app did not answer a command within the action timeout."""
+
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def event_loop() -> asyncio.AbstractEventLoop:
+    """Returns the asyncio loop (running in a daemon thread) shared by all transports."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever, name="TestAgentTransportLoop", daemon=True
+            )
+            thread.start()
+            _loop = loop
+        return _loop
+
+
+def run_sync(coro, timeout: float = None):
+    """Runs a coroutine on the transport loop and waits for its result."""
+    return asyncio.run_coroutine_threadsafe(coro, event_loop()).result(timeout)
+
+
+def encode_payload(message: dict, codec: str = "json") -> bytes:
+    if codec == "msgpack":
+        import msgpack
+
+        return msgpack.packb(message, use_bin_type=True)
+    return json.dumps(message).encode("utf-8")
+
+
+def decode_payload(payload: bytes):
+    """Decodes a frame payload; JSON objects start with '{', anything else is msgpack."""
+    if payload[:1] in (b"{", b"[", b" ", b"\n"):
+        return json.loads(payload)
+    import msgpack
+
+    return msgpack.unpackb(payload, raw=False)
+
+
+def parse_address(address):
+    """
+    Accepts "tcp://host:port", "unix:///path/to.sock", "host:port" or a
+    (host, port) tuple; returns ("tcp", (host, port)) or ("unix", path).
+    """
+    if isinstance(address, tuple):
+        return "tcp", address
+    if address.startswith("unix://"):
+        return "unix", address[len("unix://"):]
+    if address.startswith("tcp://"):
+        address = address[len("tcp://"):]
+    host, _, port = address.rpartition(":")
+    if not host or not port.isdigit():
+        raise ValueError(f"Invalid socket address: {address}")
+    return "tcp", (host.strip("[]"), int(port))
+
+
+class _AsyncTransport(abc.ABC):
+    """
+    Request/response bookkeeping shared by the asyncio transports.
+
+    Each command is sent with an added "id"; responses are matched back to
+    their command by that "id" (responses without it are answered in order),
+    so several commands can be in flight on one connection.
+
+    A timed-out command's reply may still arrive later. Apps that echo ids get
+    it dropped; for apps that don't, it would be matched to the next command,
+    so a timeout there breaks the transport instead (as does a timeout while
+    the command was still being written).
+    """
+
+    def __init__(self, action_timeout_sec: float = 5.0):
+        self.action_timeout_sec = action_timeout_sec
+        self.timeouts = 0
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._echoes_ids = False
+        self._closed_error = None
+        self._tasks = []
+
+    # --- synchronous API -------------------------------------------------
+
+    def start(self):
+        """Opens the connection (or launches the app) and starts the background readers."""
+        run_sync(self._start())
+
+    def submit(self, command: dict, timeout: float = None):
+        """Sends a command without waiting; returns a Future for its response."""
+        if timeout is None:
+            timeout = self.action_timeout_sec
+        return asyncio.run_coroutine_threadsafe(self._request(command, timeout), event_loop())
+
+    def request(self, command: dict, timeout: float = None) -> dict:
+        """Sends a command and blocks until its response arrives or the timeout expires."""
+        return self.submit(command, timeout).result()
+
+    def request_batch(self, commands: list, timeout: float = None) -> list:
+        """
+        Pipelines several commands on the connection and returns their responses
+        in order. Each command may take up to timeout after the one before it.
+        """
+        if timeout is None:
+            timeout = self.action_timeout_sec
+        futures = [self.submit(command, timeout * position)
+                   for position, command in enumerate(commands, 1)]
+        return [future.result() for future in futures]
+
+    def wait_ready(self, timeout: float = 10.0):
+        """
+        Readiness handshake: blocks until the app answers a "ping" command.
+        Any JSON reply counts (even an error for an unknown action), so apps
+        without a ping handler still work; the command simply waits in the
+        pipe until the app starts reading stdin.
+        """
+        started = time.perf_counter()
+        self.request({"action": "ping"}, timeout)
+        logger.debug(f"App ready after {time.perf_counter() - started:.3f}s")
+
+    def close(self):
+        """Closes the connection and fails any commands still waiting for a response."""
+        run_sync(self._close())
+
+    @abc.abstractmethod
+    def is_alive(self) -> bool:
+        """Whether the app process or connection is still usable."""
+
+    # --- event loop side -------------------------------------------------
+
+    @abc.abstractmethod
+    async def _start(self):
+        """Connects (or launches the app) and starts the reader tasks."""
+
+    @abc.abstractmethod
+    async def _write(self, message: dict):
+        """Sends one command and waits until it is handed to the OS."""
+
+    @abc.abstractmethod
+    async def _close(self):
+        """Tears down the connection and fails pending requests."""
+
+    def _lost_error(self) -> TransportError:
+        return TransportError("Connection to app closed unexpectedly.")
+
+    async def _request(self, command: dict, timeout: float) -> dict:
+        if self._closed_error is not None:
+            raise self._closed_error
+        if not self.is_alive():
+            raise TransportError("App is not running.")
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        written = False
+
+        async def exchange():
+            nonlocal written
+            await self._write({**command, "id": request_id})
+            written = True
+            return await future
+
+        try:
+            return await asyncio.wait_for(exchange(), timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            self._pending.pop(request_id, None)
+            error = TransportTimeout(f"No response to {command.get('action')!r} within {timeout}s")
+            if not written or not self._echoes_ids:
+                self._break(TransportError(
+                    f"Connection to app abandoned after {command.get('action')!r} timed out "
+                    f"({'partly written command' if not written else 'app does not echo ids'})."
+                ))
+            raise error from None
+        except (BrokenPipeError, ConnectionResetError) as e:
+            raise self._closed_error or self._lost_error() from e
+        finally:
+            self._pending.pop(request_id, None)
+
+    def _break(self, error: TransportError):
+        """Gives up on the connection: fails everything in flight and closes it."""
+        logger.warning(str(error))
+        self._closed_error = error
+        self._fail_pending(error)
+        asyncio.ensure_future(self._close())
+
+    def _resolve(self, response):
+        logger.debug(f"Received response: {response}")
+        request_id = response.get("id") if isinstance(response, dict) else None
+        if request_id is not None:
+            self._echoes_ids = True
+        if request_id in self._pending:
+            # The id is ours; strip it so callers see the app's state unchanged.
+            del response["id"]
+            future = self._pending.pop(request_id)
+        elif request_id is not None:
+            logger.warning(f"Dropping late response to command {request_id}: {response}")
+            return
+        elif self._pending:
+            future = self._pending.pop(next(iter(self._pending)))
+        else:
+            logger.warning(f"Dropping unsolicited or late response: {response}")
+            return
+        if not future.done():
+            future.set_result(response)
+
+    def _reject_oldest(self, error: TransportError):
+        if self._pending:
+            future = self._pending.pop(next(iter(self._pending)))
+            if not future.done():
+                future.set_exception(error)
+        else:
+            logger.warning(str(error))
+
+    def _fail_pending(self, error: Exception):
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    def _finish(self, error: TransportError):
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        # Keep the reason if the transport was already broken.
+        self._closed_error = self._closed_error or error
+        self._fail_pending(self._closed_error)
+
+
+class AsyncCLITransport(_AsyncTransport):
+    """
+    Talks to an app subprocess over non-blocking stdin/stdout pipes, one JSON
+    object per line. stderr is drained continuously so a chatty app can never
+    fill the pipe buffer and stall, and the last lines are kept for crash reports.
+    """
+
+    def __init__(self,
+                 executable_path: str,
+                 args: list = None,
+                 action_timeout_sec: float = 5.0,
+                 stderr_tail_lines: int = 200):
+        """
+        :param executable_path: Path to the app executable (e.g. built CLI tool)
+        :param args: Extra command line arguments for the app
+        :param action_timeout_sec: Default time to wait for each response.
+        :param stderr_tail_lines: How many recent stderr lines to keep for error reports.
+        """
+        super().__init__(action_timeout_sec)
+        self.executable_path = executable_path
+        self.args = list(args or [])
+        self.process = None
+        self._stderr_tail = collections.deque(maxlen=stderr_tail_lines)
+
+    def is_alive(self) -> bool:
+        return (self.process is not None and self.process.returncode is None
+                and self._closed_error is None)
+
+    def stderr_tail(self) -> str:
+        return "\n".join(self._stderr_tail)
+
+    def _lost_error(self) -> TransportError:
+        return TransportError(f"App closed unexpectedly. Stderr: {self.stderr_tail()}")
+
+    async def _start(self):
+        try:
+            self.process = await asyncio.create_subprocess_exec(
+                self.executable_path,
+                *self.args,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                limit=MAX_LINE_BYTES,
+            )
+        except OSError as e:
+            raise TransportError(f"Failed to start app {self.executable_path}: {e}") from e
+        self._closed_error = None
+        self._tasks = [
+            asyncio.ensure_future(self._read_responses()),
+            asyncio.ensure_future(self._drain_stderr()),
+        ]
+
+    async def _write(self, message: dict):
+        self.process.stdin.write((json.dumps(message) + "\n").encode("utf-8"))
+        await self.process.stdin.drain()
+
+    async def _read_responses(self):
+        while True:
+            try:
+                line = await self.process.stdout.readline()
+            except ValueError as e:
+                self._fail_pending(TransportError(f"Response line too long: {e}"))
+                continue
+            if not line:
+                break
+            if not line.strip():
+                continue
+            try:
+                response = json.loads(line)
+            except json.JSONDecodeError:
+                self._reject_oldest(TransportError(f"Failed to parse JSON response: {line!r}"))
+                continue
+            self._resolve(response)
+        # stdout closed: give stderr a moment to flush its last lines for the report.
+        try:
+            await asyncio.wait_for(asyncio.shield(self._tasks[1]), 1.0)
+        except (asyncio.TimeoutError, IndexError):
+            pass
+        self._closed_error = self._closed_error or self._lost_error()
+        self._fail_pending(self._closed_error)
+
+    async def _drain_stderr(self):
+        while True:
+            line = await self.process.stderr.readline()
+            if not line:
+                return
+            text = line.decode("utf-8", errors="replace").rstrip("\n")
+            self._stderr_tail.append(text)
+            logger.debug(f"App stderr: {text}")
+
+    async def _close(self):
+        process = self.process
+        if process is None:
+            return
+        if process.returncode is None:
+            try:
+                process.stdin.close()
+                process.terminate()
+            except ProcessLookupError:
+                pass
+            try:
+                await asyncio.wait_for(process.wait(), 5.0)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+        self._finish(TransportError("Transport closed."))
+        self.process = None
+
+
+class SocketTransport(_AsyncTransport):
+    """
+    One long-lived TCP or Unix socket connection to the app (or its Simulator
+    Bridge), carrying length-prefixed frames: a 4-byte big-endian length and a
+    JSON (or, with codec="msgpack", MessagePack) payload. Commands can be
+    pipelined: submit() several and collect their Futures.
+    """
+
+    def __init__(self,
+                 address,
+                 action_timeout_sec: float = 5.0,
+                 codec: str = "json",
+                 connect_timeout_sec: float = 10.0):
+        """
+        :param address: "tcp://host:port", "unix:///path/to.sock" or a (host, port) tuple
+        :param action_timeout_sec: Default time to wait for each response.
+        :param codec: "json" (default) or "msgpack" (requires the msgpack package).
+        :param connect_timeout_sec: How long to keep retrying while the server starts up.
+        """
+        super().__init__(action_timeout_sec)
+        if codec not in CODECS:
+            raise ValueError(f"Unknown codec {codec!r}; expected one of {CODECS}")
+        if codec == "msgpack":
+            try:
+                importlib.import_module("msgpack")
+            except ImportError as e:
+                raise ImportError("codec='msgpack' needs the msgpack package (pip install msgpack)") from e
+        self.address = address
+        self.codec = codec
+        self.connect_timeout_sec = connect_timeout_sec
+        self._reader = None
+        self._writer = None
+
+    def is_alive(self) -> bool:
+        return self._writer is not None and self._closed_error is None
+
+    async def _connect(self):
+        kind, target = parse_address(self.address)
+        if kind == "unix":
+            return await asyncio.open_unix_connection(target, limit=MAX_FRAME_BYTES)
+        return await asyncio.open_connection(*target, limit=MAX_FRAME_BYTES)
+
+    async def _start(self):
+        deadline = time.monotonic() + self.connect_timeout_sec
+        while True:
+            try:
+                self._reader, self._writer = await self._connect()
+                break
+            except OSError as e:
+                # The app may still be starting its listener.
+                if time.monotonic() >= deadline:
+                    raise TransportError(f"Failed to connect to {self.address}: {e}") from e
+                await asyncio.sleep(0.05)
+        self._closed_error = None
+        self._tasks = [asyncio.ensure_future(self._read_frames())]
+
+    async def _write(self, message: dict):
+        payload = encode_payload(message, self.codec)
+        self._writer.write(FRAME_HEADER.pack(len(payload)) + payload)
+        await self._writer.drain()
+
+    async def _read_frames(self):
+        try:
+            while True:
+                header = await self._reader.readexactly(FRAME_HEADER.size)
+                (length,) = FRAME_HEADER.unpack(header)
+                if length > MAX_FRAME_BYTES:
+                    raise TransportError(f"Frame of {length} bytes exceeds the limit")
+                payload = await self._reader.readexactly(length)
+                try:
+                    response = decode_payload(payload)
+                except Exception as e:
+                    self._reject_oldest(TransportError(f"Failed to decode response frame: {e}"))
+                    continue
+                self._resolve(response)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            error = self._lost_error()
+        except TransportError as e:
+            error = e
+        self._closed_error = self._closed_error or error
+        self._fail_pending(self._closed_error)
+
+    async def _close(self):
+        writer = self._writer
+        if writer is None:
+            return
+        writer.close()
+        try:
+            await asyncio.wait_for(writer.wait_closed(), 5.0)
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        self._finish(TransportError("Transport closed."))
+        self._reader = self._writer = None
+
+
+class HTTPTransport:
+    """
+    HTTP/1.1 keep-alive client for the Simulator Bridge. Connections are kept
+    in a small pool and reused across commands instead of opening a new one
+    per action; submit() runs commands on up to pool_size connections at once.
+    """
+
+    def __init__(self,
+                 base_url: str,
+                 action_timeout_sec: float = 5.0,
+                 pool_size: int = 4,
+                 batch_url: str = None):
+        """
+        :param base_url: URL that single JSON commands are POSTed to.
+        :param action_timeout_sec: Default time to wait for each response.
+        :param pool_size: Maximum number of idle keep-alive connections (and concurrent submits).
+        :param batch_url: Optional batch endpoint on the same server. request_batch() then
+                          POSTs a JSON array of commands there and expects an array back;
+                          without it, batches are sent one command at a time.
+        """
+        if pool_size < 1:
+            raise ValueError("HTTPTransport pool_size must be at least 1.")
+        self.base_url = base_url
+        self.batch_url = batch_url
+        self.action_timeout_sec = action_timeout_sec
+        self.pool_size = pool_size
+        url = urllib.parse.urlsplit(base_url)
+        if url.scheme not in ("http", "https") or not url.hostname:
+            raise ValueError(f"Invalid Simulator Bridge URL: {base_url}")
+        self._connection_class = (
+            http.client.HTTPSConnection if url.scheme == "https" else http.client.HTTPConnection
+        )
+        self._host, self._port = url.hostname, url.port
+        self._path = self._request_path(base_url)
+        self._batch_path = self._request_path(batch_url) if batch_url else None
+        self._idle = queue.LifoQueue()
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._closed = False
+        self.connections_opened = 0
+
+    @staticmethod
+    def _request_path(url: str) -> str:
+        parts = urllib.parse.urlsplit(url)
+        return (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+
+    def start(self):
+        """Connections are opened on first use; kept for interface parity."""
+        self._closed = False
+
+    def is_alive(self) -> bool:
+        return not self._closed
+
+    def request(self, command: dict, timeout: float = None) -> dict:
+        """POSTs one command and returns the decoded JSON response."""
+        if timeout is None:
+            timeout = self.action_timeout_sec
+        return self._post(self._path, command, timeout)
+
+    def submit(self, command: dict, timeout: float = None):
+        """Sends a command on a pooled connection without waiting; returns a Future."""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.pool_size, thread_name_prefix="TestAgentHTTP"
+                )
+            return self._executor.submit(self.request, command, timeout)
+
+    def request_batch(self, commands: list, timeout: float = None) -> list:
+        """
+        Sends several commands and returns their responses in order. With a
+        batch_url this is a single POST; timeout then applies per command.
+        """
+        if timeout is None:
+            timeout = self.action_timeout_sec
+        if not self._batch_path:
+            return [self._post(self._path, command, timeout) for command in commands]
+        responses = self._post(self._batch_path, list(commands), timeout * max(1, len(commands)))
+        if not isinstance(responses, list) or len(responses) != len(commands):
+            raise TransportError(
+                f"Batch endpoint {self.batch_url} returned {type(responses).__name__} "
+                f"instead of {len(commands)} responses"
+            )
+        return responses
+
+    def wait_ready(self, timeout: float = 10.0):
+        """Readiness handshake: blocks until the bridge answers a "ping" command."""
+        started = time.perf_counter()
+        self.request({"action": "ping"}, timeout)
+        logger.debug(f"Simulator Bridge ready after {time.perf_counter() - started:.3f}s")
+
+    def close(self):
+        """Closes every pooled connection; in-flight submits are allowed to finish."""
+        self._closed = True
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=True)
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def _checkout(self, timeout: float):
+        try:
+            return self._idle.get_nowait(), True
+        except queue.Empty:
+            self.connections_opened += 1
+            return self._connection_class(self._host, self._port, timeout=timeout), False
+
+    def _checkin(self, connection):
+        if self._closed or self._idle.qsize() >= self.pool_size:
+            connection.close()
+        else:
+            self._idle.put(connection)
+
+    def _post(self, path: str, message, timeout: float):
+        if self._closed:
+            raise TransportError("Transport closed.")
+        body = json.dumps(message).encode("utf-8")
+        headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+        while True:
+            connection, reused = self._checkout(timeout)
+            connection.timeout = timeout
+            if connection.sock is not None:
+                connection.sock.settimeout(timeout)
+            try:
+                connection.request("POST", path, body, headers)
+                response = connection.getresponse()
+                data = response.read()
+            except TimeoutError:
+                connection.close()
+                raise TransportTimeout(f"No HTTP response from {self.base_url} within {timeout}s") from None
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as e:
+                connection.close()
+                # The bridge closed an idle keep-alive connection; retry on a fresh one.
+                if reused:
+                    continue
+                raise TransportError(f"HTTP Connection failed to {self.base_url}: {e}") from e
+            except (OSError, http.client.HTTPException) as e:
+                connection.close()
+                raise TransportError(f"HTTP Connection failed to {self.base_url}: {e}") from e
+            break
+        if response.will_close:
+            connection.close()
+        else:
+            self._checkin(connection)
+        if response.status >= 400:
+            raise TransportError(
+                f"HTTP Request failed: {response.status} {response.reason}: {data[:200]!r}"
+            )
+        try:
+            decoded = json.loads(data)
+        except ValueError as e:
+            raise TransportError(f"Failed to parse JSON response: {data[:200]!r}") from e
+        logger.debug(f"Received HTTP response: {decoded}")
+        return decoded
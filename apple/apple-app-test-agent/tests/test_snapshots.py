@@ -0,0 +1,137 @@
+"""Tests for the JSON-patch delta snapshots in snapshots.py."""
+
+import copy
+import gzip
+import json
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "test_agent_python"))
+
+from snapshots import SnapshotStore, apply_patch, json_diff, read_records, read_snapshots  # noqa: E402
+
+
+def _random_value(rng: random.Random, depth: int = 0):
+    roll = rng.random()
+    if depth < 3 and roll < 0.3:
+        return {rng.choice(["a", "b", "a/b", "~c", ""]): _random_value(rng, depth + 1)
+                for _ in range(rng.randint(0, 4))}
+    if depth < 3 and roll < 0.5:
+        return [_random_value(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+    return rng.choice([0, 1, 1.5, True, False, None, "x", "y"])
+
+
+def _mutate(rng: random.Random, value, depth: int = 0):
+    if isinstance(value, dict) and value and rng.random() < 0.7:
+        key = rng.choice(list(value))
+        value[key] = _mutate(rng, value[key], depth + 1)
+        if rng.random() < 0.2:
+            value.pop(rng.choice(list(value)))
+        if rng.random() < 0.2:
+            value[rng.choice(["d", "e/f", "~0"])] = _random_value(rng, depth + 1)
+        return value
+    if isinstance(value, list) and rng.random() < 0.7:
+        roll = rng.random()
+        if roll < 0.3:
+            value.append(_random_value(rng, depth + 1))
+        elif roll < 0.5 and value:
+            value.pop()
+        elif roll < 0.6 and value:
+            value.insert(0, _random_value(rng, depth + 1))
+        elif value:
+            index = rng.randrange(len(value))
+            value[index] = _mutate(rng, value[index], depth + 1)
+        return value
+    return _random_value(rng, depth)
+
+
+class JsonPatchRoundTripTest(unittest.TestCase):
+    def assertRoundTrip(self, old, new):
+        original = copy.deepcopy(old)
+        patch = json.loads(json.dumps(json_diff(old, new)))
+        self.assertEqual(apply_patch(old, patch), new)
+        self.assertEqual(old, original, "apply_patch modified its input")
+
+    def test_examples(self):
+        cases = [
+            ({}, {}),
+            ({"a": 1}, {"a": 2}),
+            ({"a": 1}, {"b": 1}),
+            ({"a/b": {"~c": 1}}, {"a/b": {"~c": 2}}),
+            ({"cards": [1, 2, 3]}, {"cards": [1, 2, 3, 4, 5]}),
+            ({"cards": [1, 2, 3]}, {"cards": [1]}),
+            ({"cards": [1, 2, 3]}, {"cards": [0, 1, 2, 3]}),
+            ({"a": [1, {"b": 2}]}, {"a": {"b": 2}}),
+            ([1, 2], {"a": 1}),
+            ({"a": 1}, None),
+        ]
+        for old, new in cases:
+            with self.subTest(old=old, new=new):
+                self.assertRoundTrip(old, new)
+
+    def test_random_states(self):
+        rng = random.Random(25)
+        for _ in range(2000):
+            old = _random_value(rng)
+            new = _mutate(rng, copy.deepcopy(old))
+            self.assertRoundTrip(old, new)
+
+
+class SnapshotStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "snapshots.jsonl.gz")
+
+    def test_rebuilds_snapshots_from_keyframes_and_deltas(self):
+        rng = random.Random(7)
+        store = SnapshotStore(self.path, max_chain=5)
+        state = {"score": 0, "hand": [1, 2, 3], "players": {"p1": {"name": "a"}},
+                 "deck": [f"card{index}" for index in range(100)]}
+        expected = []
+        for step in range(30):
+            state = copy.deepcopy(state)
+            state["score"] = step
+            state["players"] = _mutate(rng, state["players"])
+            if step % 4 == 0:
+                state["hand"].append(step)
+            expected.append(copy.deepcopy(state))
+            store.add(f"step{step}", state)
+            state["score"] = -1  # The store must have kept its own copy.
+        store.close()
+
+        with gzip.open(self.path, "rb") as file_handle:
+            records = [json.loads(line) for line in file_handle]
+        self.assertEqual(sum("state" in record for record in records), store.keyframes)
+        self.assertTrue(any("patch" in record for record in records))
+        self.assertGreater(store.keyframes, 1)
+
+        rebuilt = [state for _, state in read_snapshots(self.path)]
+        self.assertEqual(rebuilt, expected)
+        self.assertEqual(store.get(seq=17), expected[17])
+        self.assertEqual(store.get(tag="step29"), expected[29])
+
+    def test_uses_the_callers_patch(self):
+        store = SnapshotStore(self.path)
+        store.add("before", {"score": 1, "hand": list(range(50))})
+        store.add("after", {"score": 2, "hand": list(range(50))},
+                  patch=[{"op": "replace", "path": "/score", "value": 2}])
+        store.close()
+        self.assertEqual(list(read_records(self.path))[1]["patch"],
+                         [{"op": "replace", "path": "/score", "value": 2}])
+        self.assertEqual(store.get(tag="after"), {"score": 2, "hand": list(range(50))})
+
+    def test_tolerates_a_truncated_file(self):
+        store = SnapshotStore(self.path)
+        for score in range(3):
+            store.add("step", {"score": score, "hand": list(range(50))})
+        # Simulate a killed run: the gzip stream is flushed but never closed.
+        store._file.fileobj.close()
+        self.assertEqual([state["score"] for _, state in read_snapshots(self.path)], [0, 1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark the fast-path frontmatter parser against the PyYAML path.
+
+Usage:
+    frontmatter_bench.py [--root <skills-root>] [--runs N] [--iterations N]
+
+Reports two numbers for each path:
+- startup: wall time of a fresh interpreter that imports frontmatter.py and
+  parses one SKILL.md (this is what every script invocation pays)
+- per-file: in-process parse time per SKILL.md across every skill under root
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SCRIPTS_DIR = REPO_ROOT / ".system" / "skill-creator" / "scripts"
+
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from frontmatter import FRONTMATTER_RE, _parse_flat, _Unsupported, parse_frontmatter  # noqa: E402
+
+STARTUP_SNIPPET = (
+    "import sys; sys.path.insert(0, {scripts!r}); import frontmatter; "
+    "frontmatter.parse_frontmatter(open({path!r}).read(), fast={fast})"
+)
+
+
+def find_skill_files(root):
+    files = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in {".git", "__pycache__"}]
+        if "SKILL.md" in filenames:
+            files.append(os.path.join(dirpath, "SKILL.md"))
+    return sorted(files)
+
+
+def fast_path_handles(content):
+    """Whether _parse_flat parses this SKILL.md without deferring to PyYAML."""
+    match = FRONTMATTER_RE.match(content)
+    if not match:
+        return False
+    try:
+        return _parse_flat(match.group(1)) is not None
+    except _Unsupported:
+        return False
+
+
+def bench_startup(skill_file, fast, runs):
+    code = STARTUP_SNIPPET.format(scripts=str(SCRIPTS_DIR), path=skill_file, fast=fast)
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def bench_per_file(contents, fast, iterations):
+    # Warm up once so the PyYAML path is not charged for its import.
+    for content in contents:
+        parse_frontmatter(content, fast=fast)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for content in contents:
+            parse_frontmatter(content, fast=fast)
+    return (time.perf_counter() - start) / (iterations * len(contents))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark frontmatter parsing.")
+    parser.add_argument("--root", default=str(REPO_ROOT), help="Directory to scan for SKILL.md")
+    parser.add_argument("--runs", type=int, default=20, help="Interpreter launches per path")
+    parser.add_argument("--iterations", type=int, default=200, help="Parse loops per path")
+    args = parser.parse_args()
+
+    contents = []
+    for path in find_skill_files(args.root):
+        content = Path(path).read_text()
+        try:
+            parse_frontmatter(content)
+        except Exception:
+            continue
+        contents.append((path, content))
+    if not contents:
+        print(f"No parseable SKILL.md files found under {args.root}")
+        sys.exit(1)
+
+    # The startup comparison is only meaningful on a file the fast path handles.
+    sample = next((path for path, content in contents if fast_path_handles(content)), None)
+    if sample is None:
+        print(f"No SKILL.md under {args.root} is handled by the fast path")
+        sys.exit(1)
+    texts = [content for _, content in contents]
+    results = {}
+    for label, fast in (("pyyaml", False), ("fast", True)):
+        results[label] = (
+            bench_startup(sample, fast, args.runs),
+            bench_per_file(texts, fast, args.iterations),
+        )
+
+    print(f"{len(texts)} SKILL.md files, startup sample: {os.path.relpath(sample, args.root)}")
+    print(f"{'path':<8} {'startup (ms)':>14} {'per file (us)':>15}")
+    for label, (startup, per_file) in results.items():
+        print(f"{label:<8} {startup * 1000:>14.1f} {per_file * 1e6:>15.1f}")
+    base_startup, base_file = results["pyyaml"]
+    fast_startup, fast_file = results["fast"]
+    print(
+        f"speedup: startup {base_startup / fast_startup:.2f}x, "
+        f"per file {base_file / fast_file:.2f}x "
+        "(files the fast path cannot handle still fall back to PyYAML)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark the local skill search index.
+
+Usage:
+    search_bench.py [--skills N] [--runs N]
+
+Generates N synthetic skills (SKILL.md plus agents/openai.yaml) in a temp
+directory and reports:
+- full index build time and a no-change incremental reindex
+- incremental reindex after touching 1% of the skills
+- median and p95 query latency over a fixed set of queries
+"""
+
+import argparse
+import importlib.util
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SCRIPTS_DIR = REPO_ROOT / ".system" / "skill-installer" / "scripts"
+
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+WORDS = (
+    "swift test agent game engine state sync review issue scenario logger "
+    "orchestration xcode simulator ui layout render physics audio network "
+    "database cache deploy release build lint format profile memory crash "
+    "snapshot replay pipeline report chart pdf spreadsheet slides image video"
+).split()
+QUERIES = ["test agent", "swift ui", "crash snapshot", "game", "release pipeline", "pdf report"]
+
+
+def load_search_module():
+    spec = importlib.util.spec_from_file_location("search_skills", SCRIPTS_DIR / "search-skills.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["search_skills"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def write_skills(root, count, rng):
+    for index in range(count):
+        words = rng.sample(WORDS, 8)
+        name = f"{words[0]}-{words[1]}-{index}"
+        skill_dir = Path(root) / name
+        (skill_dir / "agents").mkdir(parents=True)
+        (skill_dir / "SKILL.md").write_text(
+            f"---\nname: {name}\ndescription: Helps with {' '.join(words[2:])} tasks\n---\n\n# {name}\n"
+        )
+        (skill_dir / "agents" / "openai.yaml").write_text(
+            f'interface:\n  display_name: "{name.title()}"\n'
+            f'  short_description: "{words[2].title()} {words[3]} helper"\n'
+        )
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the skill search index.")
+    parser.add_argument("--skills", type=int, default=3000, help="Synthetic skills to index")
+    parser.add_argument("--runs", type=int, default=200, help="Queries to time")
+    args = parser.parse_args()
+
+    search_skills = load_search_module()
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory(prefix="skill-search-bench-") as tmp:
+        os.environ["CODEX_HOME"] = tmp
+        root = os.path.join(tmp, "skills")
+        write_skills(root, args.skills, rng)
+        conn = search_skills._connect(os.path.join(tmp, "index.sqlite"))
+
+        build_ms, stats = timed(search_skills.reindex, conn, [root])
+        print(f"build:   {build_ms:8.1f} ms  {stats}")
+        noop_ms, stats = timed(search_skills.reindex, conn, [root])
+        print(f"noop:    {noop_ms:8.1f} ms  {stats}")
+        for skill_dir in rng.sample(sorted(os.listdir(root)), max(1, args.skills // 100)):
+            os.utime(os.path.join(root, skill_dir, "SKILL.md"))
+        touch_ms, stats = timed(search_skills.reindex, conn, [root])
+        print(f"touched: {touch_ms:8.1f} ms  {stats}")
+
+        latencies = []
+        for run in range(args.runs):
+            elapsed, _ = timed(search_skills.search, conn, QUERIES[run % len(QUERIES)])
+            latencies.append(elapsed)
+        latencies.sort()
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        print(f"query:   median {statistics.median(latencies):.3f} ms, p95 {p95:.3f} ms")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Startup-time budget check for the skill scripts.
+
+Usage:
+    startup_bench.py [--budget <budget.json>] [--runs N]
+
+Runs each entry point as `python -X importtime <script> --help`, sums the
+import time above a bare interpreter, and fails when a script exceeds the
+budget configured for it in startup_budget.json.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BUDGET = Path(__file__).resolve().parent / "startup_budget.json"
+
+
+def parse_importtime(stderr):
+    """Return (total self time in us, {top-level module: cumulative us})"""
+    total = 0
+    top_level = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3:
+            continue
+        self_us, cumulative_us, name = int(fields[0]), int(fields[1]), fields[2]
+        total += self_us
+        if name.startswith(" ") and not name.startswith("  "):
+            top_level[name.strip()] = cumulative_us
+    return total, top_level
+
+
+def measure(args, runs):
+    env = dict(os.environ)
+    # Measure with bytecode caching, as installed scripts normally run.
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    command = [sys.executable, "-X", "importtime", *args]
+    subprocess.run(command, env=env, capture_output=True, cwd=REPO_ROOT)
+    totals = []
+    top_level = {}
+    for _ in range(runs):
+        result = subprocess.run(command, env=env, capture_output=True, text=True, cwd=REPO_ROOT)
+        total, top_level = parse_importtime(result.stderr)
+        totals.append(total)
+    return statistics.median(totals) / 1000, top_level
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check script startup import time budgets.")
+    parser.add_argument("--budget", default=str(DEFAULT_BUDGET), help="Budget JSON file")
+    parser.add_argument("--runs", type=int, default=7, help="Runs per script (median is used)")
+    args = parser.parse_args()
+
+    with open(args.budget, "r", encoding="utf-8") as f:
+        budgets = json.load(f)["budgets_ms"]
+
+    baseline_ms, _ = measure(["-c", "pass"], args.runs)
+    print(f"interpreter baseline: {baseline_ms:.1f} ms")
+    print(f"{'script':<62} {'imports (ms)':>12} {'budget':>8}  heaviest imports")
+    over_budget = []
+    for script, budget_ms in budgets.items():
+        total_ms, top_level = measure([script, "--help"], args.runs)
+        import_ms = max(total_ms - baseline_ms, 0.0)
+        heaviest = sorted(top_level.items(), key=lambda item: item[1], reverse=True)[:3]
+        heaviest_text = ", ".join(f"{name} {us / 1000:.1f}" for name, us in heaviest)
+        status = "" if import_ms <= budget_ms else "  OVER"
+        print(f"{script:<62} {import_ms:>12.1f} {budget_ms:>8.1f}{status}  {heaviest_text}")
+        if import_ms > budget_ms:
+            over_budget.append(script)
+
+    if over_budget:
+        print(f"\n[FAIL] {len(over_budget)} script(s) over budget: {', '.join(over_budget)}")
+        sys.exit(1)
+    print("\n[OK] All scripts within budget")
+
+
+if __name__ == "__main__":
+    main()